@@ -1,111 +1,54 @@
+import os
+import sys
 import pygame
-import random
-import pickle
-import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mazelib import mazefile
+from mazelib.args import maker_args
+from mazelib.constants import DX, DY
+from mazelib.grid import MazeGrid
+from mazelib.generators import kruskal, CARVE
+from mazelib.rng import make_rng
+from mazelib.trace import Tracer, phase, record
+from mazelib.render import MazeRenderer, WIDTH, HEIGHT
 
 # Constants for the display
-WIDTH, HEIGHT = 800, 800
 ROWS, COLS = 20, 20  # Number of rows and columns in the maze
-CELL_WIDTH = WIDTH // COLS
-CELL_HEIGHT = HEIGHT // ROWS
-
-# Colors
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-GREEN = (0, 255, 0)
-YELLOW = (255, 255, 0)
-DARK_GREY = (75, 75, 75)
-
-# Constants for directions
-N, S, E, W = 1, 2, 4, 8
-IN = 0x10
-DX = {E: 1, W: -1, N: 0, S: 0}
-DY = {E: 0, W: 0, N: -1, S: 1}
-OPPOSITE = {E: W, W: E, N: S, S: N}
-
-class DisjointSet:
-    def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
-
-    def find(self, u):
-        if self.parent[u] != u:
-            self.parent[u] = self.find(self.parent[u])
-        return self.parent[u]
-
-    def union(self, u, v):
-        root_u = self.find(u)
-        root_v = self.find(v)
-        if root_u != root_v:
-            if self.rank[root_u] > self.rank[root_v]:
-                self.parent[root_v] = root_u
-            elif self.rank[root_u] < self.rank[root_v]:
-                self.parent[root_u] = root_v
-            else:
-                self.parent[root_v] = root_u
-                self.rank[root_u] += 1
 
 class Maze:
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, seed=None, tracer=None):
         self.rows = rows
         self.cols = cols
-        self.grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        self.rng, seed = make_rng(seed)
+        self.grid = MazeGrid(rows, cols, algorithm="kruskal", seed=seed)
+        self.tracer = tracer
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Kruskal's Algorithm Maze Generation")
+        pygame.display.set_caption(f"Kruskal's Algorithm Maze Generation (seed {seed})")
+        self.renderer = MazeRenderer(self.screen, self.grid, wall_width=2)
 
-    def draw_maze(self, remaining_walls):
-        self.screen.fill(BLACK)
-        for y in range(self.rows):
-            for x in range(self.cols):
-                cell_x, cell_y = x * CELL_WIDTH, y * CELL_HEIGHT
-                color = DARK_GREY if self.grid[y][x] & IN == 0 else BLACK
-                pygame.draw.rect(self.screen, color, (cell_x, cell_y, CELL_WIDTH, CELL_HEIGHT))
+    def draw_maze(self):
+        self.renderer.redraw()
 
-                if self.grid[y][x] & S == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x, cell_y + CELL_HEIGHT), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 2)
-                if self.grid[y][x] & E == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x + CELL_WIDTH, cell_y), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 2)
-
-        for wall in remaining_walls:
-            x, y, direction = wall
-            if direction == S:
-                pygame.draw.line(self.screen, GREEN, (x * CELL_WIDTH, (y + 1) * CELL_HEIGHT), ((x + 1) * CELL_WIDTH, (y + 1) * CELL_HEIGHT), 2)
-            elif direction == E:
-                pygame.draw.line(self.screen, GREEN, ((x + 1) * CELL_WIDTH, y * CELL_HEIGHT), ((x + 1) * CELL_WIDTH, (y + 1) * CELL_HEIGHT), 2)
-
-        pygame.display.flip()
+    def step(self, event, x, y, direction):
+        if event == CARVE:
+            self.renderer.paint(x, y)
+            self.renderer.paint(x + DX[direction], y + DY[direction])
+        self.renderer.flush()
+        pygame.time.delay(50)
 
     def generate_maze(self):
-        dset = DisjointSet(self.rows * self.cols)
-        walls = [(x, y, S) for y in range(self.rows) for x in range(self.cols) if y < self.rows - 1] + [(x, y, E) for y in range(self.rows) for x in range(self.cols) if x < self.cols - 1]
-        random.shuffle(walls)
-        remaining_walls = set(walls)
-
-        while walls:
-            self.draw_maze(remaining_walls)
-            pygame.time.delay(50)
-
-            x, y, direction = walls.pop()
-            nx, ny = x + DX[direction], y + DY[direction]
-
-            if dset.find(y * self.cols + x) != dset.find(ny * self.cols + nx):
-                dset.union(y * self.cols + x, ny * self.cols + nx)
-                self.grid[y][x] |= direction
-                self.grid[ny][nx] |= OPPOSITE[direction]
-                self.grid[y][x] |= IN
-                self.grid[ny][nx] |= IN
-                remaining_walls.remove((x, y, direction))
-
-        self.draw_maze(remaining_walls)
-        self.save_maze("kruskal_maze_data.pkl")
+        self.draw_maze()
+        with phase(self.tracer, "generate kruskal"):
+            stats = kruskal(self.grid, self.rng, observer=self.step, tracer=self.tracer)
+        record(self.tracer, "kruskal", stats)
+        self.save_maze("kruskal_maze_data.maze")
 
     def save_maze(self, filename):
-        with open(filename, "wb") as f:
-            pickle.dump(self.grid, f)
+        mazefile.save(filename, self.grid)
 
 class MazeGame:
-    def __init__(self):
-        self.maze = Maze(ROWS, COLS)
+    def __init__(self, seed=None, tracer=None):
+        self.maze = Maze(ROWS, COLS, seed, tracer)
 
     def run(self):
         running = True
@@ -114,10 +57,15 @@ class MazeGame:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                self.maze.renderer.handle_event(event)
 
         pygame.quit()
 
 if __name__ == "__main__":
+    args = maker_args("Kruskal's algorithm maze generator")
     pygame.init()
-    game = MazeGame()
+    tracer = Tracer() if args.trace else None
+    game = MazeGame(args.seed, tracer)
     game.run()
+    if tracer:
+        tracer.dump(args.trace)
@@ -1,130 +1,78 @@
+import os
+import sys
 import pygame
-import random
 import time
-import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mazelib import mazefile
+from mazelib.args import maker_args
+from mazelib.constants import DX, DY, IN
+from mazelib.grid import MazeGrid
+from mazelib.generators import wilson, VISIT, CARVE
+from mazelib.rng import make_rng
+from mazelib.trace import Tracer, phase, record
+from mazelib.render import MazeRenderer, WIDTH, HEIGHT, BLACK, GREEN, YELLOW, DARK_GREY
 
 # Constants for the display
-WIDTH, HEIGHT = 800, 800
 ROWS, COLS = 20, 20  # Number of rows and columns in the maze
-CELL_WIDTH = WIDTH // COLS
-CELL_HEIGHT = HEIGHT // ROWS
-
-# Colors
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-GREEN = (0, 255, 0)
-YELLOW = (255, 255, 0)
-DARK_GREY = (75, 75, 75)
-
-# Constants for directions
-N, S, E, W = 1, 2, 4, 8
-IN = 0x10
-DX = {E: 1, W: -1, N: 0, S: 0}
-DY = {E: 0, W: 0, N: -1, S: 1}
-OPPOSITE = {E: W, W: E, N: S, S: N}
 
 class Maze:
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, seed=None, tracer=None):
         self.rows = rows
         self.cols = cols
-        self.grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        self.rng, seed = make_rng(seed)
+        self.grid = MazeGrid(rows, cols, algorithm="wilson", seed=seed)
+        self.tracer = tracer
+        self.path = {}  # Current walk, each cell mapped to its position on it
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Wilson's Algorithm Maze Generation")
-
-    def draw_maze(self, cx=None, cy=None, path=None):
-        self.screen.fill(BLACK)
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                cell_x, cell_y = x * CELL_WIDTH, y * CELL_HEIGHT
-                color = DARK_GREY
-                if cell & IN:
-                    color = BLACK
-                elif path and (x, y) in path:
-                    color = GREEN
-                pygame.draw.rect(self.screen, color, (cell_x, cell_y, CELL_WIDTH, CELL_HEIGHT))
-
-                if cell & S == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x, cell_y + CELL_HEIGHT), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 3)
-                if cell & E == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x + CELL_WIDTH, cell_y), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 3)
-                if cx == x and cy == y:
-                    pygame.draw.rect(self.screen, YELLOW, (cell_x, cell_y, CELL_WIDTH, CELL_HEIGHT))
-        pygame.display.flip()
-
-    def walk(self):
-        while True:
-            cx, cy = random.randint(0, self.cols - 1), random.randint(0, self.rows - 1)
-            if self.grid[cy][cx] != 0:
-                continue
-
-            visits = {(cx, cy): 0}
-            start_x, start_y = cx, cy
-            walking = True
-            path = []
-
-            while walking:
-                if (cx, cy) in path:
-                    # Loop detected, remove the looped section
-                    loop_start_index = path.index((cx, cy))
-                    path = path[:loop_start_index + 1]
-                else:
-                    path.append((cx, cy))
-
-                self.draw_maze(cx, cy, path)
-                time.sleep(0.02)
-
-                walking = False
-                for dir in random.sample([N, S, E, W], 4):
-                    nx, ny = cx + DX[dir], cy + DY[dir]
-                    if 0 <= nx < self.cols and 0 <= ny < self.rows:
-                        visits[(cx, cy)] = dir
-
-                        if self.grid[ny][nx] != 0:
-                            break
-                        else:
-                            cx, cy = nx, ny
-                            walking = True
-                            break
-
-            path = []
-            x, y = start_x, start_y
-            while (x, y) in visits:
-                dir = visits[(x, y)]
-                path.append((x, y, dir))
-                x, y = x + DX[dir], y + DY[dir]
-
-            return path
+        pygame.display.set_caption(f"Wilson's Algorithm Maze Generation (seed {seed})")
+        self.renderer = MazeRenderer(self.screen, self.grid, fill=self.cell_color)
+
+    def cell_color(self, x, y, cell):
+        if cell & IN:
+            return BLACK
+        if (x, y) in self.path:
+            return GREEN
+        return DARK_GREY
+
+    def draw_maze(self):
+        self.renderer.redraw()
+
+    def step(self, event, x, y, direction):
+        if event == VISIT:
+            if (x, y) in self.path:
+                # Loop detected, remove the looped section
+                while len(self.path) > self.path[(x, y)] + 1:
+                    cell, _ = self.path.popitem()
+                    self.renderer.paint(*cell)
+            else:
+                self.path[(x, y)] = len(self.path)
+                self.renderer.paint(x, y)
+            self.renderer.highlight((x, y), YELLOW)
+        elif event == CARVE:
+            self.renderer.highlight(None, None)
+            path, self.path = self.path, {}
+            for cell in path:
+                self.renderer.paint(*cell)
+            self.renderer.paint(x, y)
+            self.renderer.paint(x + DX[direction], y + DY[direction])
+        self.renderer.flush()
+        time.sleep(0.02)
 
     def generate_maze(self):
-        self.grid[random.randint(0, self.rows - 1)][random.randint(0, self.cols - 1)] = IN
-
-        remaining = self.rows * self.cols - 1
-
-        while remaining > 0:
-            for x, y, dir in self.walk():
-                nx, ny = x + DX[dir], y + DY[dir]
-
-                self.grid[y][x] |= dir
-                self.grid[ny][nx] |= OPPOSITE[dir]
-                self.grid[y][x] |= IN
-                self.grid[ny][nx] |= IN
-
-                remaining -= 1
-
-                self.draw_maze()
-                time.sleep(0.02)
-
         self.draw_maze()
-        self.save_maze("wilson_maze_data.pkl")
-    
+        with phase(self.tracer, "generate wilson"):
+            stats = wilson(self.grid, self.rng, observer=self.step, tracer=self.tracer)
+        record(self.tracer, "wilson", stats)
+        self.save_maze("wilson_maze_data.maze")
+
     # Save the maze data to a file
     def save_maze(self, filename):
-        with open(filename, "wb") as f:
-            pickle.dump(self.grid, f)
+        mazefile.save(filename, self.grid)
 
 class MazeGame:
-    def __init__(self):
-        self.maze = Maze(ROWS, COLS)
+    def __init__(self, seed=None, tracer=None):
+        self.maze = Maze(ROWS, COLS, seed, tracer)
 
     def run(self):
         running = True
@@ -133,10 +81,15 @@ class MazeGame:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                self.maze.renderer.handle_event(event)
 
         pygame.quit()
 
 if __name__ == "__main__":
+    args = maker_args("Wilson's algorithm maze generator")
     pygame.init()
-    game = MazeGame()
+    tracer = Tracer() if args.trace else None
+    game = MazeGame(args.seed, tracer)
     game.run()
+    if tracer:
+        tracer.dump(args.trace)
@@ -0,0 +1,158 @@
+import argparse
+import os
+import sys
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mazelib import eventlog
+from mazelib.generators import carve
+from mazelib.constants import N, S, E, W, DX, DY, IN, OPPOSITE
+from mazelib.render import MazeRenderer, WIDTH, HEIGHT, BLACK, BLUE, DARK_GREY, GREEN, RED, YELLOW
+
+FPS = 60
+MAX_SPEED = 1 << 20
+
+# Keys: space pause, [ and ] halve and double the speed, , and . step one event
+# back or forward, Home and End jump to either end, 0-9 seek to 0%-90%.
+# The arrow keys and +/- pan and zoom as in the other visualizers.
+
+class Player:
+    def __init__(self, filename, speed=1):
+        self.log = eventlog.load(filename)
+        self.total = len(self.log.events)
+        self.speed = speed
+        self.paused = False
+        self.position = 0
+        self.grid = self.log.grid.copy()
+        self.offsets = self.grid.offsets()
+        self.visited = set()
+        self.previous = None  # Last cell of the solution drawn so far
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.renderer = MazeRenderer(self.screen, self.grid, fill=self.cell_color)
+
+    def cell_color(self, x, y, cell):
+        if cell & IN:
+            return BLACK
+        return GREEN if (x, y) in self.visited else DARK_GREY
+
+    def caption(self):
+        name = self.log.algorithm or "maze"
+        state = "paused" if self.paused else f"x{self.speed}"
+        pygame.display.set_caption(f"Replay {name}: event {self.position}/{self.total} ({state})")
+
+    def apply(self, code, direction, i):
+        x, y = i % self.log.cols, i // self.log.cols
+        if code == eventlog.CARVE:
+            carve(self.grid.flat, i, i + self.offsets[direction], direction)
+            self.renderer.paint(x, y)
+            self.renderer.paint(x + DX[direction], y + DY[direction])
+        elif code == eventlog.VISIT:
+            if direction:
+                self.renderer.line((x - DX[direction], y - DY[direction]), (x, y), BLUE, 2)
+            self.renderer.highlight((x, y), YELLOW)
+        elif code == eventlog.EXPAND:
+            self.renderer.highlight((x, y), RED, radius=5)
+        elif code == eventlog.FILL:
+            self.fill_dead_end(x, y)
+        elif code == eventlog.PATH_CODE:
+            if self.previous:
+                self.renderer.line(self.previous, (x, y), RED, 3)
+            self.previous = (x, y)
+        else:
+            self.renderer.highlight((x, y), YELLOW)
+
+    def fill_dead_end(self, x, y):
+        cell = int(self.grid[y, x])
+        for direction in (N, S, E, W):
+            if cell & direction:
+                self.grid.close(x + DX[direction], y + DY[direction], OPPOSITE[direction])
+                self.renderer.paint(x + DX[direction], y + DY[direction])
+        self.grid[y, x] = 0
+        self.visited.add((x, y))
+        self.renderer.paint(x, y)
+
+    def play(self, count):
+        end = min(self.total, self.position + count)
+        events = self.log.events[self.position:end]
+        for code, direction, i in zip(events["event"].tolist(), events["direction"].tolist(), events["cell"].tolist()):
+            self.apply(code, direction, i)
+        self.position = end
+        if end == self.total:
+            self.renderer.highlight(None, None)
+        self.renderer.flush()
+
+    def seek(self, position):
+        """Rebuild the view as it stands after `position` events."""
+        position = min(max(0, position), self.total)
+        cols = self.log.cols
+        self.grid.cells[...] = eventlog.replay_grid(self.log, position).cells
+        events = self.log.events[:position]
+        filled = events["cell"][events["event"] == eventlog.FILL].tolist()
+        self.visited = {(i % cols, i // cols) for i in filled}
+
+        # Solver overlays: the search tree and as much of the solution as was found
+        self.renderer.overlays.clear()
+        visits = events[(events["event"] == eventlog.VISIT) & (events["direction"] != 0)]
+        for direction, i in zip(visits["direction"].tolist(), visits["cell"].tolist()):
+            x, y = i % cols, i // cols
+            self.renderer.overlays[((x - DX[direction], y - DY[direction]), (x, y))] = (BLUE, 2)
+        path = events["cell"][events["event"] == eventlog.PATH_CODE].tolist()
+        cells = [(i % cols, i // cols) for i in path]
+        for a, b in zip(cells, cells[1:]):
+            self.renderer.overlays[(a, b)] = (RED, 3)
+        self.previous = cells[-1] if cells else None
+
+        self.renderer.highlight(None, None)
+        if position:
+            i = int(events["cell"][-1])
+            self.renderer.highlight((i % cols, i // cols), YELLOW)
+        self.position = position
+        self.renderer.redraw()
+
+    def handle_key(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHTBRACKET:
+            self.speed = min(MAX_SPEED, self.speed * 2)
+        elif key == pygame.K_LEFTBRACKET:
+            self.speed = max(1, self.speed // 2)
+        elif key == pygame.K_PERIOD:
+            self.paused = True
+            self.play(1)
+        elif key == pygame.K_COMMA:
+            self.paused = True
+            self.seek(self.position - 1)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(self.total)
+        elif pygame.K_0 <= key <= pygame.K_9:
+            self.seek(self.total * (key - pygame.K_0) // 10)
+
+    def run(self):
+        running = True
+        clock = pygame.time.Clock()
+        self.renderer.redraw()
+
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event.key)
+                self.renderer.handle_event(event)
+            if not self.paused and self.position < self.total:
+                self.play(self.speed)
+            self.caption()
+            clock.tick(FPS)
+
+        pygame.quit()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a maze event log recorded with mazelib.eventlog")
+    parser.add_argument("log", help="event log to replay")
+    parser.add_argument("--speed", type=int, default=1, help="events per frame to start with (default: 1)")
+    args = parser.parse_args()
+    pygame.init()
+    player = Player(args.log, max(1, args.speed))
+    player.run()
@@ -1,119 +1,62 @@
+import os
+import sys
 import pygame
-import pickle
 
-# Constants for the display
-WIDTH, HEIGHT = 800, 800
-ROWS, COLS = 20, 20  # Number of rows and columns in the maze
-CELL_WIDTH = WIDTH // COLS
-CELL_HEIGHT = HEIGHT // ROWS
-
-# Colors
-BLACK = (0, 0, 0)
-GREEN = (0, 255, 0)
-DARK_GREY = (75, 75, 75)
-RED = (255, 0, 0)
-
-# Constants for directions
-N, S, E, W = 1, 2, 4, 8
-IN = 0x10
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mazelib import mazefile, solvers
+from mazelib.args import solver_args
+from mazelib.constants import DX, DY
+from mazelib.trace import Tracer
+from mazelib.render import MazeRenderer, WIDTH, HEIGHT, RED
 
 class MazeLoader:
-    def __init__(self, filename):
+    def __init__(self, filename, tracer=None):
         self.filename = filename
+        self.tracer = tracer
         self.grid = self.load_maze()
-        self.rows = len(self.grid)
-        self.cols = len(self.grid[0]) if self.rows > 0 else 0
+        self.rows = self.grid.rows
+        self.cols = self.grid.cols
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Depth-First Search Maze Solver")
+        self.renderer = MazeRenderer(self.screen, self.grid)
 
     def load_maze(self):
-        with open(self.filename, 'rb') as f:
-            return pickle.load(f)
-
-    def draw_maze(self, path=None, current=None):
-        self.screen.fill(BLACK)
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                cell_x, cell_y = x * CELL_WIDTH, y * CELL_HEIGHT
-                color = DARK_GREY
-                if cell & IN:
-                    color = BLACK
-                pygame.draw.rect(self.screen, color, (cell_x, cell_y, CELL_WIDTH, CELL_HEIGHT))
+        return mazefile.load(self.filename)
 
-                if cell & S == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x, cell_y + CELL_HEIGHT), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 3)
-                if cell & E == 0:
-                    pygame.draw.line(self.screen, GREEN, (cell_x + CELL_WIDTH, cell_y), (cell_x + CELL_WIDTH, cell_y + CELL_HEIGHT), 3)
-        
+    def draw_maze(self, path=None):
+        self.renderer.highlight(None, None)
         if path:
-            for i in range(1, len(path)):
-                start_x, start_y = path[i-1]
-                end_x, end_y = path[i]
-                start_pos = (start_x * CELL_WIDTH + CELL_WIDTH // 2, start_y * CELL_HEIGHT + CELL_HEIGHT // 2)
-                end_pos = (end_x * CELL_WIDTH + CELL_WIDTH // 2, end_y * CELL_HEIGHT + CELL_HEIGHT // 2)
-                pygame.draw.line(self.screen, RED, start_pos, end_pos, 3)
-
-        if current:
-            current_x, current_y = current
-            current_pos = (current_x * CELL_WIDTH + CELL_WIDTH // 2, current_y * CELL_HEIGHT + CELL_HEIGHT // 2)
-            pygame.draw.circle(self.screen, RED, current_pos, 5)
-
-        pygame.display.flip()
+            self.renderer.path(path, RED, 3)
+        self.renderer.flush()
 
     def dfs(self, start, end):
-        stack = [start]
-        visited = set()
+        came_from = {}
         path = []
-        backtrack = []
 
-        while stack:
-            current = stack.pop()
-            if current in visited:
-                continue
-            visited.add(current)
-            path.append(current)
-
-            self.draw_maze(path=path, current=current)
+        def step(event, x, y, direction):
+            if event == solvers.VISIT:
+                came_from[(x, y)] = (x - DX[direction], y - DY[direction]) if direction else None
+                return
+            # Backtrack to the branch point before stepping onto (x, y)
+            while path and path[-1] != came_from[(x, y)]:
+                cell = path.pop()
+                if path:
+                    self.renderer.erase_line(path[-1], cell)
+            if path:
+                self.renderer.line(path[-1], (x, y), RED, 3)
+            path.append((x, y))
+            self.renderer.highlight((x, y), RED, radius=5)
+            self.renderer.flush()
             pygame.time.wait(50)  # Delay to visualize the search
 
-            if current == end:
-                return path
-
-            x, y = current
-            neighbors = []
-            if self.grid[y][x] & N and (x, y-1) not in visited:
-                neighbors.append((x, y-1))
-            if self.grid[y][x] & S and (x, y+1) not in visited:
-                neighbors.append((x, y+1))
-            if self.grid[y][x] & E and (x+1, y) not in visited:
-                neighbors.append((x+1, y))
-            if self.grid[y][x] & W and (x-1, y) not in visited:
-                neighbors.append((x-1, y))
-
-            if not neighbors:
-                # If no unvisited neighbors, backtrack
-                while path and not neighbors:
-                    backtrack.append(path.pop())
-                    if path:
-                        x, y = path[-1]
-                        neighbors = []
-                        if self.grid[y][x] & N and (x, y-1) not in visited:
-                            neighbors.append((x, y-1))
-                        if self.grid[y][x] & S and (x, y+1) not in visited:
-                            neighbors.append((x, y+1))
-                        if self.grid[y][x] & E and (x+1, y) not in visited:
-                            neighbors.append((x+1, y))
-                        if self.grid[y][x] & W and (x-1, y) not in visited:
-                            neighbors.append((x-1, y))
-            else:
-                backtrack = []
-
-            stack.extend(neighbors)
+        path_found, _ = solvers.solve(self.grid, start, end, "dfs", observer=step, tracer=self.tracer)
+        return path_found
 
-    def run(self):
+    def run(self, start=None, end=None):
         running = True
-        start = (0, 0)
-        end = (self.cols - 1, self.rows - 1)
+        start = start or (0, 0)
+        end = end or (self.cols - 1, self.rows - 1)
+        self.renderer.redraw()
         path = self.dfs(start, end)
         self.draw_maze(path=path)
 
@@ -121,10 +64,15 @@ class MazeLoader:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                self.renderer.handle_event(event)
 
         pygame.quit()
 
 if __name__ == "__main__":
+    args = solver_args("Depth-first search maze solver", "wilson_maze_data.maze")
     pygame.init()
-    maze_loader = MazeLoader("wilson_maze_data.pkl")
-    maze_loader.run()
\ No newline at end of file
+    tracer = Tracer() if args.trace else None
+    maze_loader = MazeLoader(args.maze, tracer=tracer)
+    maze_loader.run(args.start, args.goal)
+    if tracer:
+        tracer.dump(args.trace)
\ No newline at end of file
@@ -0,0 +1,5 @@
+from .distance import distance_field
+from .generators import ALGORITHMS, from_key, generate, grid_key, maze_key
+from .grid import MazeGrid
+from .solvers import SOLVERS, solve
+from .tree import MazeTree
@@ -0,0 +1,109 @@
+"""Maze statistics for judging difficulty and generator bias.
+
+analyze() makes vectorized passes over the bitmask for the local counts and
+two breadth-first distance fields (see distance.py) for everything about
+routes. It returns a flat dict:
+
+    cells             number of cells
+    passages          open walls between two cells
+    degree_histogram  cells with 0, 1, 2, 3 and 4 open walls
+    dead_ends         cells with exactly one open wall
+    junctions         cells with three or more open walls
+    solution_length   steps from start to goal, None if unreachable
+    diameter          longest shortest path, found by double BFS: the
+                      farthest cell from the start is one end of it
+    diameter_ends     the two (x, y) cells it joins
+    river             cells off the solution path per dead end; the average
+                      size of a side branch, high when the maze has a few long
+                      dead ends rather than many short ones
+    horizontal        share of passages that run east-west
+    straight          share of corridor cells (two open walls) that go
+                      straight through rather than turn
+    algorithm         the generator recorded on the grid, if any
+
+Double BFS gives the exact diameter of a perfect maze; with loops it is a
+lower bound. summarize() averages the statistics per algorithm to compare
+generator bias.
+
+Usage: python -m mazelib.analysis maze.maze [more.maze corpus.mazes ...]
+"""
+import json
+import sys
+
+import numpy as np
+
+from .constants import N, S, E, W
+from .distance import distance_field
+
+
+def _cell(grid, i):
+    return tuple(int(v) for v in grid.coords(int(i)))
+
+
+def analyze(grid, start=None, goal=None):
+    """Statistics of one maze; start and goal default to opposite corners."""
+    start = start or (0, 0)
+    goal = goal or (grid.cols - 1, grid.rows - 1)
+    cells = grid.cells
+    degree = grid.degree()
+    histogram = np.bincount(degree.ravel(), minlength=5)[:5]
+
+    horizontal = int(np.count_nonzero(cells & E))
+    vertical = int(np.count_nonzero(cells & S))
+    passages = horizontal + vertical
+    corridors = int(histogram[2])
+    through = ((cells & (N | S)) == (N | S)) | ((cells & (E | W)) == (E | W))
+    straight = int(np.count_nonzero(through & (degree == 2)))
+
+    # Double BFS: the farthest cell from any start is one end of the diameter
+    from_start = distance_field(grid, start).ravel()
+    solution = int(from_start[grid.index(*goal)])
+    far = int(np.argmax(from_start))
+    from_far = distance_field(grid, grid.coords(far)).ravel()
+    other = int(np.argmax(from_far))
+
+    dead_ends = int(histogram[1])
+    off_path = grid.size - (solution + 1) if solution >= 0 else None
+    return {
+        "cells": grid.size,
+        "passages": passages,
+        "degree_histogram": histogram.tolist(),
+        "dead_ends": dead_ends,
+        "junctions": int(histogram[3] + histogram[4]),
+        "solution_length": solution if solution >= 0 else None,
+        "diameter": int(from_far[other]),
+        "diameter_ends": [_cell(grid, far), _cell(grid, other)],
+        "river": off_path / dead_ends if dead_ends and off_path is not None else None,
+        "horizontal": horizontal / passages if passages else None,
+        "straight": straight / corridors if corridors else None,
+        "algorithm": grid.algorithm,
+    }
+
+
+def summarize(results):
+    """Mean of every numeric statistic per algorithm, from a list of analyze() results."""
+    groups = {}
+    for result in results:
+        groups.setdefault(result["algorithm"], []).append(result)
+
+    summary = {}
+    for algorithm, group in groups.items():
+        means = {"mazes": len(group)}
+        for key, value in group[0].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                values = [result[key] for result in group if result[key] is not None]
+                means[key] = sum(values) / len(values) if values else None
+        summary[algorithm] = means
+    return summary
+
+
+if __name__ == "__main__":
+    from . import mazefile
+
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m mazelib.analysis maze.maze [more.maze corpus.mazes ...]")
+    # One JSON object per maze, so the output can be filtered line by line
+    for filename in sys.argv[1:]:
+        grids = mazefile.iter_archive(filename) if filename.endswith(".mazes") else [mazefile.load(filename)]
+        for grid in grids:
+            print(json.dumps(dict(analyze(grid), file=filename, seed=grid.seed)))
@@ -0,0 +1,33 @@
+import argparse
+
+
+def cell(text):
+    x, _, y = text.partition(",")
+    return int(x), int(y)
+
+
+def _add_trace(parser):
+    parser.add_argument("--trace", metavar="FILE", help="write the run's counters and phase timings to a JSON trace")
+
+
+def solver_args(description, default_filename, argv=None, bidirectional=False):
+    """Command line for the solver visualizers: maze file, start and goal.
+
+    With bidirectional=True the solver also offers --bidirectional.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("maze", nargs="?", default=default_filename, help=f"maze file to solve (default: {default_filename})")
+    parser.add_argument("--start", type=cell, help="start cell as x,y (default: top-left corner)")
+    parser.add_argument("--goal", type=cell, help="goal cell as x,y (default: bottom-right corner)")
+    if bidirectional:
+        parser.add_argument("--bidirectional", action="store_true", help="search from the start and the goal at once")
+    _add_trace(parser)
+    return parser.parse_args(argv)
+
+
+def maker_args(description, argv=None):
+    """Command line for the generator visualizers: an optional seed."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--seed", type=int, help="seed to reproduce a maze (default: random, shown in the title bar)")
+    _add_trace(parser)
+    return parser.parse_args(argv)
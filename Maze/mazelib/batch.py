@@ -0,0 +1,103 @@
+"""Generate mazes in bulk across a process pool.
+
+Maze k of a batch is generated with seed `base_seed + k`, so any single maze
+can be rebuilt later with generate(rows, cols, algorithm, base_seed + k).
+Mazes are written as numbered .maze files, or with --shard-size as numbered
+.mazes archives (see mazefile.py) holding that many mazes each.
+
+Usage: python -m mazelib.batch wilson 50 50 --count 100000 --seed 1 --out corpus
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from . import mazefile
+from .generators import ALGORITHMS, generate
+
+SEED_MASK = (1 << 64) - 1
+
+# Mazes per pool task when writing separate files
+MAX_CHUNK = 1000
+
+
+def maze_seed(base_seed, index):
+    return (base_seed + index) & SEED_MASK
+
+
+def _mazes(algorithm, rows, cols, base_seed, first, last):
+    for k in range(first, last):
+        yield generate(rows, cols, algorithm, seed=maze_seed(base_seed, k))
+
+
+def _run(task):
+    algorithm, rows, cols, base_seed, first, last, target = task
+    if target.endswith(".mazes"):
+        return mazefile.save_archive(target, _mazes(algorithm, rows, cols, base_seed, first, last))
+    for k, grid in enumerate(_mazes(algorithm, rows, cols, base_seed, first, last), first):
+        mazefile.save(target.format(k), grid)
+    return last - first
+
+
+def tasks(algorithm, rows, cols, count, base_seed, out, shard_size=None, workers=1):
+    """Split a batch into pool tasks; each writes one shard or a run of files."""
+    if shard_size:
+        width = len(str(max(0, (count - 1) // shard_size)))
+        for shard, first in enumerate(range(0, count, shard_size)):
+            target = os.path.join(out, f"{algorithm}_{shard:0{width}d}.mazes")
+            yield algorithm, rows, cols, base_seed, first, min(count, first + shard_size), target
+        return
+
+    width = len(str(max(0, count - 1)))
+    target = os.path.join(out, f"{algorithm}_{{:0{width}d}}.maze")
+    chunk = max(1, min(MAX_CHUNK, count // (workers * 4)))
+    for first in range(0, count, chunk):
+        yield algorithm, rows, cols, base_seed, first, min(count, first + chunk), target
+
+
+def generate_batch(algorithm, rows, cols, count, base_seed, out, shard_size=None, workers=None, progress=None):
+    """Generate `count` mazes into directory `out`; returns the number written.
+
+    `progress(done, count)` is called as tasks finish.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown maze algorithm: {algorithm!r}")
+    os.makedirs(out, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    with Pool(workers) as pool:
+        for written in pool.imap_unordered(_run, tasks(algorithm, rows, cols, count, base_seed, out, shard_size, workers)):
+            done += written
+            if progress:
+                progress(done, count)
+    return done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate many mazes in parallel.")
+    parser.add_argument("algorithm", choices=sorted(ALGORITHMS), help="maze generation algorithm")
+    parser.add_argument("rows", type=int, help="rows per maze")
+    parser.add_argument("cols", type=int, help="columns per maze")
+    parser.add_argument("--count", type=int, default=1, help="number of mazes (default: 1)")
+    parser.add_argument("--seed", type=int, help="base seed; maze k uses seed + k (default: random)")
+    parser.add_argument("--out", default="mazes", help="output directory (default: mazes)")
+    parser.add_argument("--shard-size", type=int, help="write .mazes archives of this many mazes instead of one file each")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    base_seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(63)
+    print(f"{args.algorithm} {args.rows}x{args.cols}, base seed {base_seed}", file=sys.stderr)
+
+    def progress(done, count):
+        print(f"\r{done}/{count}", end="", file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    done = generate_batch(args.algorithm, args.rows, args.cols, args.count, base_seed, args.out,
+                          args.shard_size, args.workers, progress)
+    print(f"\nwrote {done} mazes to {args.out} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
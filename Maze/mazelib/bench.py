@@ -0,0 +1,173 @@
+"""Benchmarks for every generator and solver.
+
+Each case (one algorithm at one size) runs in a fresh worker process, so its
+peak RSS is not inflated by earlier cases. A case is timed `repeat` times
+and the best and mean wall times are kept, along with the work counters
+the algorithm returns (see trace.py). It is then run once more under
+tracemalloc for the peak traced allocation, which covers NumPy buffers as
+well as Python objects. Solvers run corner to corner on a maze built
+beforehand with a fixed seed, outside the timed region. Results are written
+as JSON. Passing --compare with an earlier results file flags every case
+that got slower by more than --threshold.
+
+Usage: python -m mazelib.bench --sizes 32,64,128,256,512,1024 --out bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .generators import ALGORITHMS, generate
+from .solvers import SOLVERS
+from .trace import Tracer
+
+DEFAULT_SIZES = (32, 64, 128, 256, 512, 1024)
+
+
+def _run_case(kind, algorithm, size, seed, repeat, maze_algorithm):
+    if kind == "generator":
+        prefix = f"{algorithm}."
+
+        # The tracer adds a few phase timings and one counter update per run
+        def run():
+            tracer = Tracer()
+            generate(size, size, algorithm, seed, tracer=tracer)
+            return {name[len(prefix):]: value for name, value in tracer.counters.items() if name.startswith(prefix)}
+    else:
+        grid = generate(size, size, maze_algorithm, seed)
+        solver = SOLVERS[algorithm]
+        goal = (size - 1, size - 1)
+
+        def run():
+            path, stats = solver(grid, (0, 0), goal)
+            return dict(stats, path_length=len(path))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stats = run()
+        times.append(time.perf_counter() - started)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    run()
+    alloc_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return dict(
+        stats,
+        kind=kind,
+        algorithm=algorithm,
+        size=size,
+        best=min(times),
+        mean=sum(times) / len(times),
+        peak_rss=rss_after * scale,
+        rss_growth=(rss_after - rss_before) * scale,
+        alloc_peak=alloc_peak,
+    )
+
+
+def cases(generators, solvers, sizes):
+    for size in sizes:
+        for algorithm in generators:
+            yield "generator", algorithm, size
+        for algorithm in solvers:
+            yield "solver", algorithm, size
+
+
+def run_benchmarks(generators, solvers, sizes, seed=1, repeat=3, maze_algorithm="kruskal", report=None):
+    """Run every case and return the list of results; report(result) is called after each."""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    # maxtasksperchild=1 gives every case a process of its own
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for kind, algorithm, size in cases(generators, solvers, sizes):
+            result = pool.apply(_run_case, (kind, algorithm, size, seed, repeat, maze_algorithm))
+            results.append(result)
+            if report:
+                report(result)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Cases whose best time grew by more than `threshold` (a ratio) against baseline."""
+    before = {(r["kind"], r["algorithm"], r["size"]): r for r in baseline["results"]}
+    slower = []
+    for result in results:
+        old = before.get((result["kind"], result["algorithm"], result["size"]))
+        if old and old["best"] > 0 and result["best"] / old["best"] > threshold:
+            slower.append((result, result["best"] / old["best"]))
+    return slower
+
+
+def _print_result(result):
+    # Cells expanded by a solver, walls carved by a generator
+    work = result.get("expanded", result.get("carved", ""))
+    print(f"{result['kind']:9} {result['algorithm']:20} {result['size']:>5} "
+          f"{result['best'] * 1000:>10.1f} ms {str(work):>10} "
+          f"{result['peak_rss'] / 2 ** 20:>8.1f} MiB {result['alloc_peak'] / 2 ** 20:>8.1f} MiB", flush=True)
+
+
+def _names(text, known):
+    names = known if text == "all" else [name for name in text.split(",") if name]
+    for name in names:
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"unknown algorithm: {name!r}")
+    return list(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the maze generators and solvers.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma separated maze side lengths")
+    parser.add_argument("--generators", default="all", help="comma separated generators, or all, or an empty string for none")
+    parser.add_argument("--solvers", default="all", help="comma separated solvers, or all, or an empty string for none")
+    parser.add_argument("--seed", type=int, default=1, help="seed for every maze (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (default: 3)")
+    parser.add_argument("--maze", default="kruskal", choices=sorted(ALGORITHMS), help="generator for the solver mazes (default: kruskal)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.1, help="slowdown ratio reported as a regression (default: 1.1)")
+    args = parser.parse_args(argv)
+
+    try:
+        generators = _names(args.generators, sorted(ALGORITHMS))
+        solvers = _names(args.solvers, sorted(SOLVERS))
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    print(f"{'kind':9} {'algorithm':20} {'size':>5} {'best':>13} {'work':>10} {'peak RSS':>12} {'allocated':>12}")
+    results = run_benchmarks(generators, solvers, sizes, args.seed, args.repeat, args.maze, _print_result)
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "maze": args.maze,
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.threshold)
+        for result, ratio in slower:
+            print(f"slower: {result['kind']} {result['algorithm']} {result['size']} x{ratio:.2f}")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
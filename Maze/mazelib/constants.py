@@ -0,0 +1,6 @@
+# Constants for directions
+N, S, E, W = 1, 2, 4, 8
+IN = 0x10
+DX = {E: 1, W: -1, N: 0, S: 0}
+DY = {E: 0, W: 0, N: -1, S: 1}
+OPPOSITE = {E: W, W: E, N: S, S: N}
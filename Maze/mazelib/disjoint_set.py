@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class DisjointSet:
+    """Union-find over 0..n-1 with path halving and union by size.
+
+    `parent` and `size` are flat NumPy arrays (4 bytes per element below 2**31
+    elements); the loops go through memoryviews of them, which index much
+    faster than the arrays themselves. find() is iterative, so long chains
+    can't hit the recursion limit.
+    """
+
+    def __init__(self, n):
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        self.parent = np.arange(n, dtype=dtype)
+        self.size = np.ones(n, dtype=dtype)
+        self._parent = memoryview(self.parent)
+        self._size = memoryview(self.size)
+
+    def find(self, u):
+        parent = self._parent
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    def union(self, u, v):
+        """Merge the sets holding u and v; return False if they already match."""
+        root_u = self.find(u)
+        root_v = self.find(v)
+        if root_u == root_v:
+            return False
+        size = self._size
+        if size[root_u] < size[root_v]:
+            root_u, root_v = root_v, root_u
+        self._parent[root_v] = root_u
+        size[root_u] += size[root_v]
+        return True
+
+    def union_many(self, us, vs):
+        """Union each pair (us[k], vs[k]) in order.
+
+        Returns a bool array that is True where the pair joined two sets, which
+        is exactly the set of edges Kruskal keeps.
+        """
+        parent = self._parent
+        size = self._size
+        merged = np.zeros(len(us), dtype=bool)
+        flags = memoryview(merged.view(np.uint8))
+        for k, (u, v) in enumerate(zip(np.asarray(us).tolist(), np.asarray(vs).tolist())):
+            while parent[u] != u:
+                parent[u] = parent[parent[u]]
+                u = parent[u]
+            while parent[v] != v:
+                parent[v] = parent[parent[v]]
+                v = parent[v]
+            if u == v:
+                continue
+            if size[u] < size[v]:
+                u, v = v, u
+            parent[v] = u
+            size[u] += size[v]
+            flags[k] = 1
+        return merged
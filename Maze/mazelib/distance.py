@@ -0,0 +1,68 @@
+"""Whole-grid distance fields.
+
+distance_field() gives the number of steps from the nearest of one or more
+source cells to every cell of a maze, as a (rows, cols) int32 array with -1
+for cells that can't be reached. It runs a breadth-first search one frontier
+at a time: the frontier is an array of flat cell indices, and each direction
+expands all of it with one open-wall mask and one index shift, so the Python
+overhead is per level rather than per cell.
+
+Perfect mazes are mostly long corridors, where the frontier is a handful of
+cells for thousands of levels and NumPy's per-call overhead would dominate.
+Frontiers smaller than SMALL_FRONTIER are expanded with plain scalar loops
+instead.
+"""
+import numpy as np
+
+# Below this many cells a level is cheaper to expand one cell at a time
+SMALL_FRONTIER = 32
+
+
+def _sources(grid, sources):
+    points = np.asarray(sources, dtype=np.int64)
+    points = points.reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+    if np.any((x < 0) | (x >= grid.cols) | (y < 0) | (y >= grid.rows)):
+        raise ValueError(f"source cells outside the {grid.cols}x{grid.rows} maze")
+    return np.unique(y * grid.cols + x)
+
+
+def distance_field(grid, sources):
+    """Steps from the nearest source to every cell; `sources` is one (x, y) or a sequence of them."""
+    cells = grid.flat
+    dist = np.full(grid.size, -1, dtype=np.int32)
+    frontier = _sources(grid, sources)
+    dist[frontier] = 0
+    moves = tuple(grid.offsets().items())
+    cell_view, dist_view = memoryview(cells), memoryview(dist)
+
+    level = 0
+    while len(frontier):
+        level += 1
+        # Small frontiers stay plain lists until they grow again
+        if len(frontier) < SMALL_FRONTIER:
+            reached = []
+            for i in frontier if isinstance(frontier, list) else frontier.tolist():
+                cell = cell_view[i]
+                for d, offset in moves:
+                    if cell & d:
+                        j = i + offset
+                        if dist_view[j] < 0:
+                            dist_view[j] = level
+                            reached.append(j)
+            frontier = reached
+            continue
+
+        frontier = np.asarray(frontier, dtype=np.intp)
+        open_walls = cells[frontier]
+        reached = []
+        for d, offset in moves:
+            # One shift can't map two frontier cells onto the same cell, and
+            # marking each direction's cells before the next one runs keeps
+            # cells on loops from being reached twice
+            neighbours = frontier[(open_walls & d) != 0] + offset
+            neighbours = neighbours[dist[neighbours] < 0]
+            dist[neighbours] = level
+            reached.append(neighbours)
+        frontier = np.concatenate(reached)
+    return dist.reshape(grid.rows, grid.cols)
@@ -0,0 +1,216 @@
+"""Binary event logs of generator and solver runs.
+
+An EventRecorder is an observer (see generators.py and solvers.py) that
+writes every event to a file instead of drawing it, so a run goes at full
+speed and can be animated later by the player in "Maze Player". A log is a
+64-byte little-endian header, then the starting grid (solver logs only, one
+byte per cell), then one 6-byte record per event:
+
+    offset  size  field
+    0       4     magic b"MZEV"
+    4       2     format version
+    6       2     header size
+    8       4     rows
+    12      4     cols
+    16      4     flags (bit 0: seed is present, bit 1: starting grid follows)
+    20      8     seed
+    28      8     number of events
+    36      24    algorithm name, ASCII, NUL padded
+    60      4     reserved
+
+    record: event code (1 byte), direction (1 byte), flat cell index (4 bytes)
+
+Solvers' final paths are logged as a run of PATH events.
+
+Usage: python -m mazelib.eventlog generate wilson 50 50 wilson.mzev [--seed 1]
+       python -m mazelib.eventlog solve maze.maze astar astar.mzev [--start x,y] [--goal x,y]
+"""
+import argparse
+import os
+import struct
+from array import array
+from collections import namedtuple
+
+import numpy as np
+
+from .constants import IN, OPPOSITE
+from .grid import MazeGrid
+
+MAGIC = b"MZEV"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQQ24s4x")
+HEADER_SIZE = HEADER.size
+FLAG_SEED = 0x1
+FLAG_GRID = 0x2
+
+PATH = "path"
+# Observer event names by code; 0 is unused. Never renumber.
+EVENTS = (None, "visit", "backtrack", "carve", "reject", "expand", "fill", PATH)
+CODES = {name: code for code, name in enumerate(EVENTS) if name}
+VISIT, BACKTRACK, CARVE, REJECT, EXPAND, FILL = (CODES[name] for name in EVENTS[1:7])
+PATH_CODE = CODES[PATH]
+
+RECORD = np.dtype([("event", "u1"), ("direction", "u1"), ("cell", "<u4")])
+
+EventLog = namedtuple("EventLog", "rows cols algorithm seed grid events")
+
+
+class EventRecorder:
+    """Observer that writes the events it receives to `filename`.
+
+    Pass `start_grid=True` for solver runs, whose logs must carry the maze
+    being solved; generator logs start from an empty grid. Use as a context
+    manager, or call close() when the run is over.
+    """
+
+    def __init__(self, filename, grid, algorithm=None, seed=None, start_grid=False, chunk=1 << 16):
+        self.cols = grid.cols
+        self.chunk = chunk
+        self.count = 0
+        self._header = (grid.rows, grid.cols, (FLAG_SEED if seed is not None else 0) | (FLAG_GRID if start_grid else 0),
+                        seed or 0, (algorithm or "").encode("ascii"))
+        if len(self._header[-1]) > 24:
+            raise ValueError(f"algorithm name too long for the header: {algorithm!r}")
+        self._file = open(filename, "wb")
+        self._write_header()
+        if start_grid:
+            self._file.write(np.ascontiguousarray(grid.cells).data)
+        self._events = bytearray()
+        self._directions = bytearray()
+        self._cells = array("I")
+
+    def _write_header(self):
+        rows, cols, flags, seed, name = self._header
+        self._file.write(HEADER.pack(MAGIC, VERSION, HEADER_SIZE, rows, cols, flags, seed, self.count, name))
+
+    def __call__(self, event, x, y, direction):
+        self._events.append(CODES[event])
+        self._directions.append(direction)
+        self._cells.append(y * self.cols + x)
+        if len(self._cells) >= self.chunk:
+            self._flush()
+
+    def path(self, cells):
+        for x, y in cells:
+            self(PATH, x, y, 0)
+
+    def _flush(self):
+        records = np.empty(len(self._cells), dtype=RECORD)
+        records["event"] = np.frombuffer(self._events, dtype=np.uint8)
+        records["direction"] = np.frombuffer(self._directions, dtype=np.uint8)
+        records["cell"] = np.frombuffer(self._cells, dtype=np.uint32)
+        self._file.write(records.tobytes())
+        self.count += len(records)
+        self._events = bytearray()
+        self._directions = bytearray()
+        self._cells = array("I")
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        # The event count is only known now
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(filename):
+    """Read a log; the events are memory-mapped as a RECORD array."""
+    with open(filename, "rb") as f:
+        data = f.read(HEADER_SIZE)
+    if len(data) < HEADER_SIZE or data[:4] != MAGIC:
+        raise ValueError(f"{filename} is not a maze event log")
+    magic, version, header_size, rows, cols, flags, seed, count, name = HEADER.unpack(data)
+    if version != VERSION or header_size != HEADER_SIZE:
+        raise ValueError(f"{filename} uses unsupported event log version {version}")
+
+    body = rows * cols if flags & FLAG_GRID else 0
+    if os.path.getsize(filename) != HEADER_SIZE + body + count * RECORD.itemsize:
+        raise ValueError(f"{filename} is truncated or was not closed")
+    algorithm = name.rstrip(b"\0").decode("ascii") or None
+    seed = seed if flags & FLAG_SEED else None
+
+    if body:
+        cells = np.fromfile(filename, dtype=np.uint8, count=body, offset=HEADER_SIZE).reshape(rows, cols)
+    else:
+        cells = None
+    grid = MazeGrid(rows, cols, cells, algorithm=algorithm, seed=seed)
+    if count:
+        events = np.memmap(filename, dtype=RECORD, mode="r", offset=HEADER_SIZE + body, shape=(count,))
+    else:
+        events = np.empty(0, dtype=RECORD)
+    return EventLog(rows, cols, algorithm, seed, grid, events)
+
+
+def replay_grid(log, end):
+    """The grid after the first `end` events.
+
+    Carved walls are opened and dead-end filled cells are walled off, as the
+    visualizers do, in a few vectorized passes rather than event by event.
+    """
+    grid = log.grid.copy()
+    flat = grid.flat
+    events = log.events[:end]
+    carves = events[events["event"] == CARVE]
+    cells = carves["cell"].astype(np.int64)
+    for direction, offset in grid.offsets().items():
+        i = cells[carves["direction"] == direction]
+        flat[i] |= direction | IN
+        flat[i + offset] |= OPPOSITE[direction] | IN
+
+    filled = events["cell"][events["event"] == FILL].astype(np.int64)
+    for direction, offset in grid.offsets().items():
+        i = filled[(flat[filled] & direction) != 0]
+        flat[i + offset] &= ~OPPOSITE[direction] & 0xFF
+    flat[filled] = 0
+    return grid
+
+
+def main(argv=None):
+    from .args import cell
+    from .generators import ALGORITHMS, generate
+    from .rng import make_rng
+    from .solvers import SOLVERS, solve
+    from . import mazefile
+
+    parser = argparse.ArgumentParser(description="Record a generator or solver run as an event log.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate", help="record a maze being generated")
+    gen.add_argument("algorithm", choices=sorted(ALGORITHMS))
+    gen.add_argument("rows", type=int)
+    gen.add_argument("cols", type=int)
+    gen.add_argument("log", help="event log to write")
+    gen.add_argument("--seed", type=int, help="maze seed (default: random)")
+    sol = commands.add_parser("solve", help="record a maze being solved")
+    sol.add_argument("maze", help="maze file to solve")
+    sol.add_argument("algorithm", choices=sorted(SOLVERS))
+    sol.add_argument("log", help="event log to write")
+    sol.add_argument("--start", type=cell, help="start cell as x,y (default: top-left corner)")
+    sol.add_argument("--goal", type=cell, help="goal cell as x,y (default: bottom-right corner)")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        # Fix the seed up front so it can go in the header
+        seed = make_rng(args.seed)[1]
+        empty = MazeGrid(args.rows, args.cols)
+        with EventRecorder(args.log, empty, args.algorithm, seed) as recorder:
+            generate(args.rows, args.cols, args.algorithm, seed, recorder)
+    else:
+        grid = mazefile.load(args.maze)
+        start = args.start or (0, 0)
+        goal = args.goal or (grid.cols - 1, grid.rows - 1)
+        with EventRecorder(args.log, grid, args.algorithm, start_grid=True) as recorder:
+            path, _ = solve(grid, start, goal, args.algorithm, recorder)
+            recorder.path(path)
+    print(args.log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Headless maze generators.
+
+Each generator carves a perfect maze into a MazeGrid (see grid.py)
+without touching the display. Visualizers follow the carving through an
+optional observer, called as ``observer(event, x, y, direction)``:
+
+    VISIT      the algorithm steps onto cell (x, y)
+    BACKTRACK  the backtracker leaves cell (x, y) for good
+    CARVE      the wall between (x, y) and its neighbour in `direction` is removed
+    REJECT     Kruskal keeps the wall between (x, y) and its neighbour in `direction`
+
+Every generator returns a dict of counters describing the work it did (see
+trace.py); generate() hands them to an optional tracer.
+
+Generators only draw from the random.Random they are given, so a maze is
+fully determined by (algorithm, rows, cols, seed). maze_key() packs those
+into 16 bytes and from_key() rebuilds the maze, which lets a cache store keys
+instead of grids. Keys stay valid only while the generators draw their random
+numbers in the same order.
+"""
+import struct
+
+import numpy as np
+
+from .constants import N, S, E, W, IN, DX, DY, OPPOSITE
+from .disjoint_set import DisjointSet
+from .grid import MazeGrid
+from .rng import make_rng
+from .trace import phase, record
+
+VISIT = "visit"
+BACKTRACK = "backtrack"
+CARVE = "carve"
+REJECT = "reject"
+
+KRUSKAL_CHUNK = 1 << 16
+
+
+def carve(cells, i, j, direction):
+    cells[i] |= direction | IN
+    cells[j] |= OPPOSITE[direction] | IN
+
+
+def backtracker(grid, rng, observer=None, tracer=None):
+    rows, cols = grid.rows, grid.cols
+    cells = grid.buffer()
+    step = grid.offsets()
+    cells[0] |= IN
+    stack = [0]
+    if observer:
+        observer(VISIT, 0, 0, 0)
+
+    while stack:
+        i = stack[-1]
+        y, x = divmod(i, cols)
+        neighbours = []
+        if y > 0 and not cells[i - cols]:
+            neighbours.append(N)
+        if y < rows - 1 and not cells[i + cols]:
+            neighbours.append(S)
+        if x > 0 and not cells[i - 1]:
+            neighbours.append(W)
+        if x < cols - 1 and not cells[i + 1]:
+            neighbours.append(E)
+
+        if neighbours:
+            direction = rng.choice(neighbours)
+            j = i + step[direction]
+            carve(cells, i, j, direction)
+            stack.append(j)
+            if observer:
+                observer(CARVE, x, y, direction)
+                observer(VISIT, x + DX[direction], y + DY[direction], 0)
+        else:
+            stack.pop()
+            if observer:
+                observer(BACKTRACK, x, y, 0)
+
+    # Every cell is carved into once, except the first, and left once
+    return {"carved": rows * cols - 1, "backtracks": rows * cols}
+
+
+def wall_ids(rows, cols):
+    """Every inner wall as an integer: cell * 2 for its south wall, cell * 2 + 1 for its east wall."""
+    n = rows * cols
+    dtype = np.uint32 if 2 * n < 2 ** 32 else np.uint64
+    south = np.arange(0, 2 * (n - cols), 2, dtype=dtype)
+    east = np.arange(1, 2 * n, 2, dtype=dtype).reshape(rows, cols)[:, :-1].ravel()
+    return np.concatenate((south, east))
+
+
+def kruskal(grid, rng, observer=None, tracer=None):
+    rows, cols = grid.rows, grid.cols
+    cells = grid.buffer()
+    flat = np.asarray(cells)
+    with phase(tracer, "kruskal shuffle"):
+        dset = DisjointSet(rows * cols)
+        walls = wall_ids(rows, cols)
+        np.random.default_rng(rng.getrandbits(64)).shuffle(walls)
+    remaining = rows * cols - 1
+    tried = 0
+
+    # Union a chunk of walls at a time so no per-wall Python objects are kept around
+    with phase(tracer, "kruskal union"):
+        for start in range(0, len(walls), KRUSKAL_CHUNK):
+            if remaining == 0:
+                break
+            chunk = walls[start:start + KRUSKAL_CHUNK]
+            tried += len(chunk)
+            i = (chunk >> 1).astype(np.int64)
+            east = (chunk & 1).astype(bool)
+            j = i + np.where(east, 1, cols)
+            merged = dset.union_many(i, j)
+            remaining -= int(np.count_nonzero(merged))
+
+            if observer:
+                for a, b, is_east, keep in zip(i.tolist(), j.tolist(), east.tolist(), merged.tolist()):
+                    direction = E if is_east else S
+                    if keep:
+                        carve(cells, a, b, direction)
+                    observer(CARVE if keep else REJECT, a % cols, a // cols, direction)
+                continue
+
+            # A cell has one south and one east wall, so indices are unique per direction
+            for mask, direction in ((merged & ~east, S), (merged & east, E)):
+                flat[i[mask]] |= direction | IN
+                flat[j[mask]] |= OPPOSITE[direction] | IN
+
+    carved = rows * cols - 1 - remaining
+    # union_many() runs two finds per wall it tries
+    return {"walls": len(walls), "tried": tried, "finds": 2 * tried, "unions": carved, "carved": carved}
+
+
+def wilson(grid, rng, observer=None, tracer=None):
+    rows, cols = grid.rows, grid.cols
+    cells = grid.buffer()
+    step = grid.offsets()
+    # Last exit direction of every cell on the current walk. Overwriting it when
+    # the walk comes back to a cell erases the loop in O(1).
+    exits = bytearray(rows * cols)
+    directions = (N, S, E, W)
+    randbits = rng.getrandbits
+    cells[rng.randrange(rows * cols)] = IN
+    walks = steps = 0
+
+    # Any order of walk starts gives a uniform spanning tree, so scan once
+    for start in range(rows * cols):
+        if cells[start]:
+            continue
+
+        i = start
+        y, x = divmod(i, cols)
+        walks += 1
+        while not cells[i]:
+            if observer:
+                observer(VISIT, x, y, 0)
+            while True:
+                direction = directions[randbits(2)]
+                nx, ny = x + DX[direction], y + DY[direction]
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    break
+            exits[i] = direction
+            i += step[direction]
+            x, y = nx, ny
+            steps += 1
+
+        # Follow the surviving exits from the start into the maze
+        i = start
+        while True:
+            direction = exits[i]
+            j = i + step[direction]
+            joined = cells[j]
+            carve(cells, i, j, direction)
+            if observer:
+                observer(CARVE, i % cols, i // cols, direction)
+            if joined:
+                break
+            i = j
+
+    # Each step of a walk is either carved or erased with a loop
+    carved = rows * cols - 1
+    return {"walks": walks, "walk_steps": steps, "erased_steps": steps - carved, "carved": carved}
+
+
+ALGORITHMS = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+}
+
+
+# Stable numbers for the algorithms in maze keys; never reuse one
+ALGORITHM_IDS = {
+    "backtracker": 1,
+    "kruskal": 2,
+    "wilson": 3,
+}
+KEY = struct.Struct("<HHHxxQ")
+
+
+def generate(rows, cols, algorithm="wilson", seed=None, observer=None, tracer=None):
+    """Generate a rows x cols maze and return it as a MazeGrid.
+
+    `seed` may be an int, a random.Random, a NumPy Generator or None (see
+    rng.make_rng); the seed actually used is stored in grid.seed. A
+    trace.Tracer receives the generator's counters and phase timings.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown maze algorithm: {algorithm!r}")
+    rng, seed = make_rng(seed)
+    grid = MazeGrid(rows, cols, algorithm=algorithm, seed=seed)
+    with phase(tracer, f"generate {algorithm}"):
+        stats = ALGORITHMS[algorithm](grid, rng, observer, tracer)
+    record(tracer, algorithm, stats)
+    return grid
+
+
+def maze_key(algorithm, rows, cols, seed):
+    """Pack everything needed to regenerate a maze into 16 bytes.
+
+    Rows and cols are stored in 16 bits each, so keys only cover mazes of up
+    to 65535 x 65535 cells.
+    """
+    if algorithm not in ALGORITHM_IDS:
+        raise ValueError(f"unknown maze algorithm: {algorithm!r}")
+    if not (0 <= rows < 1 << 16 and 0 <= cols < 1 << 16):
+        raise ValueError(f"a {rows}x{cols} maze does not fit in a maze key (rows and cols must be 0-65535)")
+    if not 0 <= seed < 1 << 64:
+        raise ValueError(f"seed {seed} does not fit in a maze key")
+    return KEY.pack(ALGORITHM_IDS[algorithm], rows, cols, seed)
+
+
+def grid_key(grid):
+    """maze_key() of a generated grid; its algorithm and seed must be known."""
+    if grid.algorithm is None or grid.seed is None:
+        raise ValueError("the grid has no recorded algorithm and seed")
+    return maze_key(grid.algorithm, grid.rows, grid.cols, grid.seed)
+
+
+def from_key(key, observer=None, tracer=None):
+    """Regenerate the maze described by a maze_key()."""
+    number, rows, cols, seed = KEY.unpack(key)
+    for algorithm, algorithm_id in ALGORITHM_IDS.items():
+        if algorithm_id == number:
+            return generate(rows, cols, algorithm, seed, observer, tracer)
+    raise ValueError(f"unknown algorithm number in maze key: {number}")
@@ -0,0 +1,142 @@
+import numpy as np
+
+from .constants import N, S, E, W, IN, DX, DY
+
+
+def check_weights(weights, rows, cols):
+    """Raise ValueError unless `weights` is a (rows, cols) array of non-negative int64-range integers."""
+    if not isinstance(weights, np.ndarray) or weights.shape != (rows, cols) or weights.dtype.kind not in "ui":
+        shape, dtype = getattr(weights, "shape", None), getattr(weights, "dtype", type(weights).__name__)
+        raise ValueError(f"expected ({rows}, {cols}) integer weights, got {shape} {dtype}")
+    if weights.dtype.kind == "i" and weights.size and weights.min() < 0:
+        raise ValueError("weights must not be negative")
+    # Solvers work on int64 costs
+    if weights.dtype.kind == "u" and weights.dtype.itemsize == 8 and weights.size and weights.max() > np.iinfo(np.int64).max:
+        raise ValueError(f"weights must not exceed {np.iinfo(np.int64).max}")
+
+
+class MazeGrid:
+    """A maze stored as one byte per cell using the N/S/E/W/IN bitmask.
+
+    `cells` is a (rows, cols) uint8 array; `grid[y][x]` and `grid[y, x]` index
+    it directly so code written against nested lists keeps working. Hot loops
+    should use `buffer()` and flat indices (`y * cols + x`) instead.
+
+    `weights`, if given, is a parallel (rows, cols) array of non-negative
+    integers: the cost of stepping into each cell, e.g. 1 for floor and 5 for
+    mud. It is checked whenever it is assigned, and again by dijkstra(), which
+    finds the cheapest paths under it; without weights every step costs 1.
+    """
+
+    def __init__(self, rows, cols, cells=None, algorithm=None, seed=None, weights=None):
+        if cells is None:
+            cells = np.zeros((rows, cols), dtype=np.uint8)
+        if cells.shape != (rows, cols) or cells.dtype != np.uint8:
+            raise ValueError(f"expected a ({rows}, {cols}) uint8 array, got {cells.shape} {cells.dtype}")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.weights = weights
+        # Provenance, recorded in saved maze files
+        self.algorithm = algorithm
+        self.seed = seed
+
+    @property
+    def weights(self):
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights):
+        if weights is not None:
+            check_weights(weights, self.rows, self.cols)
+        self._weights = weights
+
+    @classmethod
+    def from_list(cls, grid):
+        rows = len(grid)
+        cols = len(grid[0]) if rows > 0 else 0
+        return cls(rows, cols, np.array(grid, dtype=np.uint8).reshape(rows, cols))
+
+    def tolist(self):
+        return self.cells.tolist()
+
+    def copy(self):
+        weights = None if self.weights is None else np.array(self.weights)
+        return MazeGrid(self.rows, self.cols, np.array(self.cells), self.algorithm, self.seed, weights)
+
+    def view(self, x0, y0, x1, y1):
+        """Zero-copy sub-grid covering columns x0..x1-1 and rows y0..y1-1."""
+        cells = self.cells[y0:y1, x0:x1]
+        weights = None if self.weights is None else self.weights[y0:y1, x0:x1]
+        return MazeGrid(cells.shape[0], cells.shape[1], cells, weights=weights)
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, MazeGrid):
+            return NotImplemented
+        return self.cells.shape == other.cells.shape and bool(np.array_equal(self.cells, other.cells))
+
+    def __repr__(self):
+        return f"MazeGrid(rows={self.rows}, cols={self.cols})"
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    @property
+    def flat(self):
+        # reshape only copies if the grid is a non-contiguous view
+        return self.cells.reshape(-1)
+
+    def buffer(self):
+        """Writable flat memoryview of the cells, for fast scalar access."""
+        if not self.cells.flags.c_contiguous:
+            raise ValueError("buffer() needs a contiguous grid; copy() the view first")
+        return memoryview(self.cells.reshape(-1))
+
+    def offsets(self):
+        """Flat index offset of the neighbour in each direction."""
+        return {N: -self.cols, S: self.cols, E: 1, W: -1}
+
+    def index(self, x, y):
+        return y * self.cols + x
+
+    def coords(self, i):
+        return i % self.cols, i // self.cols
+
+    def cell(self, x, y):
+        return int(self.cells[y, x])
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def neighbors(self, x, y):
+        """Cells reachable from (x, y) through an open wall."""
+        cell = int(self.cells[y, x])
+        return [(x + DX[d], y + DY[d]) for d in (N, S, E, W) if cell & d]
+
+    def close(self, x, y, direction):
+        """Clear the open bit for `direction` on (x, y) only."""
+        self.cells[y, x] &= ~direction & 0xFF
+
+    def open_mask(self, direction):
+        return (self.cells & direction) != 0
+
+    def degree(self):
+        """Number of open walls per cell, as a (rows, cols) array."""
+        cells = self.cells
+        return ((cells & N) != 0).astype(np.uint8) + ((cells & S) != 0) + ((cells & E) != 0) + ((cells & W) != 0)
+
+    def carved(self):
+        return (self.cells & IN) != 0
@@ -0,0 +1,177 @@
+"""Offscreen maze images.
+
+Mazes are drawn straight into NumPy pixel arrays from the wall bits, with no
+display and no per-cell draw calls. Every cell is a `cell_size` square whose
+top and left `wall` pixels hold its north and west walls, which are opened
+when the cell's N or W bit is set; the east and south border is one extra
+wall strip. A solution path is painted over the cells it visits.
+
+The writers render a band of rows at a time and stream it to disk, so memory
+stays bounded however large the maze is. PNGs are written as 2-bit palette
+images (four pixels per byte, which keeps zlib's input small), PPMs as
+binary RGB.
+
+Usage: python -m mazelib.image maze.maze out.png [--cell-size 4] [--wall 1] [--solve]
+"""
+import argparse
+import struct
+import zlib
+
+import numpy as np
+
+from .constants import N, W, IN
+
+# Palette indices; the colours match the pygame visualizers
+PASSAGE, WALL, UNCARVED, PATH = range(4)
+PALETTE = np.array([
+    (0, 0, 0),
+    (0, 255, 0),
+    (75, 75, 75),
+    (255, 0, 0),
+], dtype=np.uint8)
+
+# Pixels per band when streaming an image to disk
+BAND_PIXELS = 1 << 22
+
+
+class _Overlay:
+    """A path split into the cells it covers and the walls it passes through,
+    sorted by row so each band can slice out its part."""
+
+    def __init__(self, path, rows):
+        points = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+        xs, ys = points[:, 0], points[:, 1]
+        order = np.argsort(ys, kind="stable")
+        self.x, self.y = xs[order], ys[order]
+        self.rows = np.searchsorted(self.y, np.arange(rows + 1))
+
+        # Each step opens the N or W wall of whichever cell comes later
+        x, y = np.maximum(xs[:-1], xs[1:]), np.maximum(ys[:-1], ys[1:])
+        vertical = xs[:-1] == xs[1:]
+        order = np.argsort(y, kind="stable")
+        self.link_x, self.link_y, self.link_vertical = x[order], y[order], vertical[order]
+        self.link_rows = np.searchsorted(self.link_y, np.arange(rows + 1))
+
+
+def _check(cell_size, wall):
+    if not 1 <= wall < cell_size:
+        raise ValueError(f"need 1 <= wall < cell_size, got wall={wall}, cell_size={cell_size}")
+
+
+def _band(cells, y0, y1, cell_size, wall, overlay=None):
+    """Palette indices for cell rows y0..y1-1, without the bottom border."""
+    c, w = cell_size, wall
+    band = cells[y0:y1]
+    rows, cols = band.shape
+    out = np.full((rows * c, cols * c + w), WALL, dtype=np.uint8)
+    # Splitting both axes is always a view, so writes to blocks land in out
+    blocks = out[:, :cols * c].reshape(rows, c, cols, c)
+
+    blocks[:, w:, :, w:] = np.where(band & IN, PASSAGE, UNCARVED)[:, None, :, None]
+    blocks[:, :w, :, w:] = np.where(band & N, PASSAGE, WALL)[:, None, :, None]
+    blocks[:, w:, :, :w] = np.where(band & W, PASSAGE, WALL)[:, None, :, None]
+
+    if overlay is not None:
+        a, b = overlay.rows[y0], overlay.rows[y1]
+        blocks[overlay.y[a:b] - y0, w:, overlay.x[a:b], w:] = PATH
+        a, b = overlay.link_rows[y0], overlay.link_rows[y1]
+        x, y, vertical = overlay.link_x[a:b], overlay.link_y[a:b] - y0, overlay.link_vertical[a:b]
+        blocks[y[vertical], :w, x[vertical], w:] = PATH
+        blocks[y[~vertical], w:, x[~vertical], :w] = PATH
+    return out
+
+
+def _bands(grid, path, cell_size, wall):
+    """Yield the image as consecutive (height, width) blocks of palette indices."""
+    _check(cell_size, wall)
+    overlay = _Overlay(path, grid.rows) if path is not None and len(path) else None
+    width = grid.cols * cell_size + wall
+    step = max(1, BAND_PIXELS // (width * cell_size))
+    for y0 in range(0, grid.rows, step):
+        yield _band(grid.cells, y0, min(grid.rows, y0 + step), cell_size, wall, overlay)
+    yield np.full((wall, width), WALL, dtype=np.uint8)
+
+
+def image_size(grid, cell_size=4, wall=1):
+    """(width, height) in pixels of the image of `grid`."""
+    return grid.cols * cell_size + wall, grid.rows * cell_size + wall
+
+
+def render(grid, path=None, cell_size=4, wall=1):
+    """Render the maze as a (height, width, 3) uint8 RGB array.
+
+    pygame.surfarray.make_surface(image.swapaxes(0, 1)) turns it into a surface.
+    """
+    return PALETTE[np.concatenate(list(_bands(grid, path, cell_size, wall)))]
+
+
+def _chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def _pack(band):
+    """Pack palette indices four to a byte, first pixel in the high bits."""
+    height, width = band.shape
+    padded = np.zeros((height, -(-width // 4) * 4), dtype=np.uint8)
+    padded[:, :width] = band
+    quads = padded.reshape(height, -1, 4)
+    return (quads[:, :, 0] << 6) | (quads[:, :, 1] << 4) | (quads[:, :, 2] << 2) | quads[:, :, 3]
+
+
+def write_png(filename, grid, path=None, cell_size=4, wall=1, level=1):
+    width, height = image_size(grid, cell_size, wall)
+    compressor = zlib.compressobj(level)
+    with open(filename, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        # 2-bit palette image, default compression/filter, no interlace
+        _chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 2, 3, 0, 0, 0))
+        _chunk(f, b"PLTE", PALETTE.tobytes())
+        for band in _bands(grid, path, cell_size, wall):
+            packed = _pack(band)
+            # Every scanline starts with filter type 0 (none)
+            lines = np.zeros((packed.shape[0], packed.shape[1] + 1), dtype=np.uint8)
+            lines[:, 1:] = packed
+            data = compressor.compress(lines)
+            if data:
+                _chunk(f, b"IDAT", data)
+        _chunk(f, b"IDAT", compressor.flush())
+        _chunk(f, b"IEND", b"")
+
+
+def write_ppm(filename, grid, path=None, cell_size=4, wall=1):
+    width, height = image_size(grid, cell_size, wall)
+    with open(filename, "wb") as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+        for band in _bands(grid, path, cell_size, wall):
+            f.write(PALETTE[band].data)
+
+
+def save_image(filename, grid, path=None, cell_size=4, wall=1):
+    """Write the maze to a .png or .ppm file, picked by the extension."""
+    lower = filename.lower()
+    if lower.endswith(".png"):
+        write_png(filename, grid, path, cell_size, wall)
+    elif lower.endswith(".ppm"):
+        write_ppm(filename, grid, path, cell_size, wall)
+    else:
+        raise ValueError(f"unsupported image format: {filename}")
+
+
+if __name__ == "__main__":
+    from . import mazefile
+    from .solvers import solve
+
+    parser = argparse.ArgumentParser(description="Render a maze file to a PNG or PPM image.")
+    parser.add_argument("maze", help="maze file to render")
+    parser.add_argument("image", help="output image, .png or .ppm")
+    parser.add_argument("--cell-size", type=int, default=4, help="pixels per cell (default: 4)")
+    parser.add_argument("--wall", type=int, default=1, help="wall thickness in pixels (default: 1)")
+    parser.add_argument("--solve", action="store_true", help="draw the path between opposite corners")
+    args = parser.parse_args()
+
+    grid = mazefile.load(args.maze)
+    path = solve(grid, (0, 0), (grid.cols - 1, grid.rows - 1))[0] if args.solve else None
+    save_image(args.image, grid, path, args.cell_size, args.wall)
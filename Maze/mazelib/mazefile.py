@@ -0,0 +1,181 @@
+"""Binary maze files.
+
+A .maze file is a fixed 64-byte little-endian header followed by the grid
+as raw bytes, one N/S/E/W/IN bitmask per cell in row-major order:
+
+    offset  size  field
+    0       4     magic b"MAZE"
+    4       2     format version
+    6       2     header size (body offset)
+    8       4     rows
+    12      4     cols
+    16      4     flags (bit 0: seed is present)
+    20      8     seed
+    28      4     CRC-32 of the body
+    32      16    algorithm name, ASCII, NUL padded
+    48      16    reserved
+
+Loading memory-maps the body, so opening a huge maze is instant and only the
+pages a solver touches are read from disk.
+
+A .mazes archive is any number of maze files written back to back; each
+header says how long its body is, so no index is needed.
+
+Usage: python -m mazelib.mazefile old_maze.pkl [new_maze.maze]
+"""
+import os
+import pickle
+import struct
+import sys
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+from .constants import N, S, E, W, IN
+from .grid import MazeGrid
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIQI16s16x")
+HEADER_SIZE = HEADER.size
+FLAG_SEED = 0x1
+
+MazeHeader = namedtuple("MazeHeader", "version rows cols algorithm seed checksum")
+
+
+def _checksum(cells, chunk_rows=4096):
+    crc = 0
+    for y in range(0, cells.shape[0], chunk_rows):
+        crc = zlib.crc32(np.ascontiguousarray(cells[y:y + chunk_rows]), crc)
+    return crc
+
+
+def _write(f, grid, algorithm=None, seed=None):
+    algorithm = algorithm if algorithm is not None else grid.algorithm
+    seed = seed if seed is not None else grid.seed
+    name = (algorithm or "").encode("ascii")
+    if len(name) > 16:
+        raise ValueError(f"algorithm name too long for the header: {algorithm!r}")
+
+    f.write(HEADER.pack(MAGIC, VERSION, HEADER_SIZE, grid.rows, grid.cols,
+                        FLAG_SEED if seed is not None else 0, seed or 0,
+                        _checksum(grid.cells), name))
+    f.write(np.ascontiguousarray(grid.cells).data)
+
+
+def save(filename, grid, algorithm=None, seed=None):
+    with open(filename, "wb") as f:
+        _write(f, grid, algorithm, seed)
+
+
+def save_archive(filename, grids):
+    """Write every grid in `grids` to one .mazes archive; returns the count."""
+    count = 0
+    with open(filename, "wb") as f:
+        for grid in grids:
+            _write(f, grid)
+            count += 1
+    return count
+
+
+def _parse_header(data, filename):
+    if len(data) < HEADER_SIZE or data[:4] != MAGIC:
+        raise ValueError(f"{filename} is not a maze file")
+
+    magic, version, header_size, rows, cols, flags, seed, checksum, name = HEADER.unpack(data)
+    if version != VERSION or header_size != HEADER_SIZE:
+        raise ValueError(f"{filename} uses unsupported maze format version {version}")
+    algorithm = name.rstrip(b"\0").decode("ascii") or None
+    return MazeHeader(version, rows, cols, algorithm, seed if flags & FLAG_SEED else None, checksum)
+
+
+def read_header(filename):
+    with open(filename, "rb") as f:
+        return _parse_header(f.read(HEADER_SIZE), filename)
+
+
+def load(filename, mode="r", verify=False):
+    """Load a maze file as a MazeGrid.
+
+    `mode` is passed to numpy.memmap: "r" maps read-only, "r+" writes changes
+    back to the file and "c" is copy-on-write. Pass mode=None to read the
+    whole body into memory instead. `verify` checks the body against the
+    header checksum, which reads every page.
+    """
+    header = read_header(filename)
+    expected = HEADER_SIZE + header.rows * header.cols
+    if os.path.getsize(filename) != expected:
+        raise ValueError(f"{filename} is truncated or has trailing data")
+
+    shape = (header.rows, header.cols)
+    if mode is None or header.rows * header.cols == 0:
+        with open(filename, "rb") as f:
+            f.seek(HEADER_SIZE)
+            cells = np.fromfile(f, dtype=np.uint8, count=header.rows * header.cols).reshape(shape)
+    else:
+        cells = np.memmap(filename, dtype=np.uint8, mode=mode, offset=HEADER_SIZE, shape=shape)
+
+    if verify and _checksum(cells) != header.checksum:
+        raise ValueError(f"{filename} failed its checksum")
+    return MazeGrid(header.rows, header.cols, cells, algorithm=header.algorithm, seed=header.seed)
+
+
+def iter_archive(filename, verify=False):
+    """Yield every maze in a .mazes archive as a read-only memory-mapped MazeGrid."""
+    if os.path.getsize(filename) == 0:
+        return
+    data = np.memmap(filename, dtype=np.uint8, mode="r")
+    offset = 0
+    while offset < len(data):
+        header = _parse_header(data[offset:offset + HEADER_SIZE].tobytes(), filename)
+        start = offset + HEADER_SIZE
+        offset = start + header.rows * header.cols
+        if offset > len(data):
+            raise ValueError(f"{filename} is truncated")
+
+        cells = data[start:offset].reshape(header.rows, header.cols)
+        if verify and _checksum(cells) != header.checksum:
+            raise ValueError(f"{filename} failed its checksum at byte {start - HEADER_SIZE}")
+        yield MazeGrid(header.rows, header.cols, cells, algorithm=header.algorithm, seed=header.seed)
+
+
+def from_legacy(data):
+    """Build a MazeGrid from an unpickled maker output.
+
+    Accepts both the bitmask grids written by the Kruskal and Wilson makers and
+    the (down, right, visited) tuples written by the old backtracker.
+    """
+    if not data or not data[0] or not isinstance(data[0][0], tuple):
+        return MazeGrid.from_list(data)
+
+    rows, cols = len(data), len(data[0])
+    grid = MazeGrid(rows, cols)
+    cells = grid.cells
+    for y, row in enumerate(data):
+        for x, (down, right, visited) in enumerate(row):
+            if visited:
+                cells[y, x] |= IN
+            if not down and y < rows - 1:
+                cells[y, x] |= S
+                cells[y + 1, x] |= N
+            if not right and x < cols - 1:
+                cells[y, x] |= E
+                cells[y, x + 1] |= W
+    return grid
+
+
+def convert_pickle(src, dst=None, algorithm=None):
+    """Convert a legacy .pkl maze to a .maze file. Only use on trusted files."""
+    if dst is None:
+        dst = os.path.splitext(src)[0] + ".maze"
+    with open(src, "rb") as f:
+        grid = from_legacy(pickle.load(f))
+    save(dst, grid, algorithm=algorithm)
+    return dst
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python -m mazelib.mazefile old_maze.pkl [new_maze.maze]")
+    print(convert_pickle(*sys.argv[1:]))
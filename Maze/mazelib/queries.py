@@ -0,0 +1,161 @@
+"""Many path queries against one maze.
+
+solve_many() decodes the wall bits once into a CSR adjacency (`indptr`,
+`indices`: the neighbours of cell i are indices[indptr[i]:indptr[i + 1]])
+and answers every (start, goal) pair over it with breadth-first search.
+Queries that share a start are answered by a single search that runs until
+all of their goals are found.
+
+With workers > 1 the queries are split across a process pool, and the
+adjacency is placed in shared memory so that every worker reads the same
+copy instead of receiving its own.
+"""
+from array import array
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from .solvers import _index
+
+
+class Adjacency:
+    """CSR adjacency of a maze over flat cell indices."""
+
+    def __init__(self, indptr, indices, cols):
+        self.indptr = indptr
+        self.indices = indices
+        self.cols = cols
+        self.size = len(indptr) - 1
+        self._indptr = memoryview(indptr)
+        self._indices = memoryview(indices)
+        self._parent = array("i", [-1]) * self.size
+        # Cells reached and goals wanted are marked with the search number,
+        # so nothing needs clearing between searches
+        self._reached = array("i", [0]) * self.size
+        self._wanted = array("i", [0]) * self.size
+        self._search = 0
+
+    @classmethod
+    def from_grid(cls, grid):
+        cells = grid.flat
+        n = grid.size
+        ids = np.arange(n, dtype=np.int32)
+        # One column per direction, -1 where the wall is closed
+        neighbours = np.full((n, 4), -1, dtype=np.int32)
+        for k, (d, offset) in enumerate(grid.offsets().items()):
+            open_walls = (cells & d) != 0
+            neighbours[open_walls, k] = ids[open_walls] + offset
+        indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.count_nonzero(neighbours >= 0, axis=1), out=indptr[1:])
+        return cls(indptr, neighbours[neighbours >= 0], grid.cols)
+
+    def paths_from(self, s, goals):
+        """Shortest paths from cell s to each cell in `goals`, as {goal: path}."""
+        indptr, indices, cols = self._indptr, self._indices, self.cols
+        parent, reached, wanted = self._parent, self._reached, self._wanted
+        self._search += 1
+        mark = self._search
+        reached[s] = mark
+        parent[s] = s
+        remaining = 0
+        for goal in goals:
+            if wanted[goal] != mark and goal != s:
+                wanted[goal] = mark
+                remaining += 1
+
+        # A list can be appended to while it is iterated, which makes it the
+        # cheapest queue here; slicing the memoryview avoids a range per cell
+        queue = [s]
+        for i in queue:
+            if not remaining:
+                break
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                if reached[j] != mark:
+                    reached[j] = mark
+                    parent[j] = i
+                    queue.append(j)
+                    if wanted[j] == mark:
+                        remaining -= 1
+
+        paths = {}
+        for goal in goals:
+            if reached[goal] != mark:
+                paths[goal] = []
+                continue
+            path = []
+            i = goal
+            while i != s:
+                path.append((i % cols, i // cols))
+                i = parent[i]
+            path.append((s % cols, s // cols))
+            path.reverse()
+            paths[goal] = path
+        return paths
+
+
+def _answer(adjacency, groups):
+    """Solve groups of (start, [(query number, goal), ...]); returns (query number, path) pairs."""
+    answers = []
+    for s, queries in groups:
+        paths = adjacency.paths_from(s, [goal for _, goal in queries])
+        answers.extend((k, paths[goal]) for k, goal in queries)
+    return answers
+
+
+_worker_adjacency = None
+_worker_memory = []
+
+
+def _share(values):
+    memory = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    np.ndarray(values.shape, values.dtype, buffer=memory.buf)[:] = values
+    return memory
+
+
+def _attach(name, length):
+    memory = shared_memory.SharedMemory(name=name)
+    _worker_memory.append(memory)
+    return np.ndarray(length, np.int32, buffer=memory.buf)
+
+
+def _init_worker(indptr, indices, cols):
+    global _worker_adjacency
+    _worker_adjacency = Adjacency(_attach(*indptr), _attach(*indices), cols)
+
+
+def _answer_in_worker(groups):
+    return _answer(_worker_adjacency, groups)
+
+
+def solve_many(grid, queries, workers=None, adjacency=None):
+    """Shortest paths for a list of (start, goal) cell pairs on one maze.
+
+    Returns one path per query, in order, in the same format as the solvers
+    (an empty list when the goal can't be reached). Pass a prebuilt
+    `adjacency` to reuse it across calls.
+    """
+    adjacency = adjacency or Adjacency.from_grid(grid)
+    groups = {}
+    for k, (start, goal) in enumerate(queries):
+        groups.setdefault(_index(grid, start), []).append((k, _index(grid, goal)))
+    groups = list(groups.items())
+
+    if not workers or workers <= 1 or len(groups) <= 1:
+        answers = _answer(adjacency, groups)
+    else:
+        shared = [_share(adjacency.indptr), _share(adjacency.indices)]
+        try:
+            specs = [(memory.name, len(values)) for memory, values in zip(shared, (adjacency.indptr, adjacency.indices))]
+            chunk = -(-len(groups) // (workers * 4))
+            with Pool(workers, _init_worker, (*specs, adjacency.cols)) as pool:
+                parts = pool.map(_answer_in_worker, [groups[k:k + chunk] for k in range(0, len(groups), chunk)])
+        finally:
+            for memory in shared:
+                memory.close()
+                memory.unlink()
+        answers = [answer for part in parts for answer in part]
+
+    paths = [None] * len(queries)
+    for k, path in answers:
+        paths[k] = path
+    return paths
@@ -0,0 +1,264 @@
+import numpy as np
+import pygame
+
+from .constants import N, S, E, W, IN
+
+# Constants for the display
+WIDTH, HEIGHT = 800, 800
+MIN_CELL_SIZE = 4  # Mazes that would be drawn smaller than this get a scrollable viewport
+
+# Colors
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GREEN = (0, 255, 0)
+YELLOW = (255, 255, 0)
+DARK_GREY = (75, 75, 75)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def default_fill(x, y, cell):
+    return BLACK if cell & IN else DARK_GREY
+
+
+def _runs(closed):
+    """(start, end) index pairs of every run of True values, end exclusive."""
+    edges = np.diff(np.concatenate(([0], closed.view(np.int8), [0])))
+    return zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist())
+
+
+class MazeRenderer:
+    """Incremental pygame renderer for a MazeGrid.
+
+    The maze lives on a background surface that is drawn once. Callers repaint
+    only the cells and overlay lines that changed and then call flush(), which
+    copies just those areas to the screen and pushes them with
+    pygame.display.update(rects). A frame costs the same on any maze size.
+
+    `fill(x, y, cell)` picks the colour of a cell each time it is painted.
+    Mazes too big for the window are shown through a viewport that
+    handle_event() pans with the arrow keys and zooms with +/-.
+    """
+
+    def __init__(self, screen, grid, fill=default_fill, wall_color=GREEN, wall_width=3):
+        self.screen = screen
+        self.grid = grid
+        self.fill = fill
+        self.wall_color = wall_color
+        self.wall_width = wall_width
+        self.width, self.height = screen.get_size()
+        self.background = pygame.Surface((self.width, self.height))
+        self.dirty = []
+        self.marker = None
+        self.marker_rect = None
+        # Lines drawn over the maze, replayed whenever the view changes
+        self.overlays = {}
+
+        self.origin = (0, 0)
+        self.cell_size = max(MIN_CELL_SIZE, min(self.width // grid.cols, self.height // grid.rows))
+        self._layout()
+
+    def _layout(self):
+        """Precompute pixel coordinates for the current zoom and origin."""
+        size = self.cell_size
+        x0, y0 = self.origin
+        self.cell_width = self.cell_height = size
+        self.left = [(x - x0) * size for x in range(self.grid.cols + 1)]
+        self.top = [(y - y0) * size for y in range(self.grid.rows + 1)]
+        self.center_x = [left + size // 2 for left in self.left]
+        self.center_y = [top + size // 2 for top in self.top]
+        self.visible_cols = range(x0, min(self.grid.cols, x0 + -(-self.width // size)))
+        self.visible_rows = range(y0, min(self.grid.rows, y0 + -(-self.height // size)))
+        self.line_width = max(1, min(self.wall_width, size // 4))
+
+    def _scale(self, width):
+        return max(1, min(width, self.cell_size // 4))
+
+    def visible(self, x, y):
+        return x in self.visible_cols and y in self.visible_rows
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(self.left[x], self.top[y], self.cell_width, self.cell_height)
+
+    def center(self, x, y):
+        return self.center_x[x], self.center_y[y]
+
+    def paint(self, x, y):
+        """Repaint one cell and its walls on the background."""
+        if not self.visible(x, y):
+            return
+        rect = self.cell_rect(x, y)
+        cell = int(self.grid[y, x])
+        surface = self.background
+        color, width = self.wall_color, self.line_width
+
+        # Each cell draws its own half of a shared wall, so painting one cell
+        # never leaves stale pixels in (or paints over) its neighbours
+        surface.set_clip(rect)
+        surface.fill(self.fill(x, y, cell), rect)
+        if not cell & N:
+            pygame.draw.line(surface, color, rect.topleft, rect.topright, width)
+        if not cell & S:
+            pygame.draw.line(surface, color, rect.bottomleft, rect.bottomright, width)
+        if not cell & W:
+            pygame.draw.line(surface, color, rect.topleft, rect.bottomleft, width)
+        if not cell & E:
+            pygame.draw.line(surface, color, rect.topright, rect.bottomright, width)
+        # Surface.fill shifts rects with negative corners instead of cropping them
+        for corner in (rect.topleft, rect.topright, rect.bottomleft, rect.bottomright):
+            surface.fill(color, self._post(*corner).clip(rect))
+        surface.set_clip(None)
+        self.dirty.append(rect)
+
+    def _post(self, px, py):
+        """The square where wall lines meet at the grid point (px, py).
+
+        Thick lines stop exactly at their end points, so the corners where
+        walls join would be drawn differently depending on which lines happen
+        to be painted. Every grid point gets a post the width of a wall
+        instead, and a cell always paints the quarters of its four posts.
+        """
+        width = self.line_width
+        return pygame.Rect(px - (width - 1) // 2, py - (width - 1) // 2, width, width)
+
+    def _posts(self, cols, rows):
+        """Draw the posts of every visible grid point in a few array slices."""
+        pixels = pygame.surfarray.pixels2d(self.background)
+        value = self.background.map_rgb(self.wall_color)
+        size, (width, height) = self.cell_size, pixels.shape
+        # Grid points are `size` pixels apart, starting at pixel 0 of the view
+        x_end = min(width, self.left[cols.stop] + size)
+        y_end = min(height, self.top[rows.stop] + size)
+        for dx in range(self.line_width):
+            for dy in range(self.line_width):
+                x0 = dx - (self.line_width - 1) // 2
+                y0 = dy - (self.line_width - 1) // 2
+                x_stop = min(x_end, self.left[cols.stop] + x0 + 1)
+                y_stop = min(y_end, self.top[rows.stop] + y0 + 1)
+                pixels[x0 % size:x_stop:size, y0 % size:y_stop:size] = value
+        del pixels
+
+    def _polyline(self, cells, color, width):
+        points = [(self.center_x[x], self.center_y[y]) for x, y in cells]
+        self.dirty.append(pygame.draw.lines(self.background, color, False, points, self._scale(width)))
+
+    def line(self, a, b, color, width):
+        """Draw a line between the centres of cells a and b on the background."""
+        self.overlays[(a, b)] = (color, width)
+        self._polyline((a, b), color, width)
+
+    def path(self, cells, color, width):
+        """Draw a path through the centres of `cells` as a single polyline."""
+        cells = tuple(cells)
+        if len(cells) > 1:
+            self.overlays[cells] = (color, width)
+            self._polyline(cells, color, width)
+
+    def erase_line(self, a, b):
+        """Remove the line between a and b, restoring whatever it covered."""
+        self.overlays.pop((a, b), None)
+        self.paint(*a)
+        self.paint(*b)
+        for cells, (color, width) in self.overlays.items():
+            if a in cells or b in cells:
+                self._polyline(cells, color, width)
+
+    def highlight(self, cell, color, radius=None):
+        """Mark `cell` on screen only, replacing the previous mark.
+
+        The cell is filled with `color`, or gets a dot of `radius` if given.
+        Pass cell=None to remove the mark.
+        """
+        if self.marker_rect:
+            self.dirty.append(self.marker_rect)
+            self.marker_rect = None
+        self.marker = (cell, color, radius) if cell else None
+
+    def _draw_marker(self):
+        cell, color, radius = self.marker
+        if not self.visible(*cell):
+            return
+        if radius is None:
+            self.marker_rect = self.screen.fill(color, self.cell_rect(*cell))
+        else:
+            self.marker_rect = pygame.draw.circle(self.screen, color, self.center(*cell), max(1, min(radius, self.cell_size // 3)))
+        self.dirty.append(self.marker_rect)
+
+    def flush(self):
+        """Push everything changed since the last flush to the display."""
+        for rect in self.dirty:
+            self.screen.blit(self.background, rect, rect)
+        if self.marker:
+            self._draw_marker()
+        pygame.display.update(self.dirty)
+        self.dirty = []
+
+    def redraw(self):
+        """Repaint the whole view and show it."""
+        surface = self.background
+        surface.fill(BLACK)
+        cols, rows = self.visible_cols, self.visible_rows
+        cells = self.grid.cells[rows.start:rows.stop, cols.start:cols.stop]
+        for y in rows:
+            for x in cols:
+                color = self.fill(x, y, int(self.grid[y, x]))
+                if color != BLACK:
+                    surface.fill(color, self.cell_rect(x, y))
+
+        # Draw each straight run of wall as one line instead of one per cell
+        color, width = self.wall_color, self.line_width
+        left, top = self.left, self.top
+        boundaries = [(cells[0] & N) == 0] + [(cells[y] & S) == 0 for y in range(len(rows))]
+        for y, closed in zip(range(rows.start, rows.stop + 1), boundaries):
+            for start, end in _runs(closed):
+                pygame.draw.line(surface, color, (left[cols.start + start], top[y]), (left[cols.start + end], top[y]), width)
+        boundaries = [(cells[:, 0] & W) == 0] + [(cells[:, x] & E) == 0 for x in range(len(cols))]
+        for x, closed in zip(range(cols.start, cols.stop + 1), boundaries):
+            for start, end in _runs(closed):
+                pygame.draw.line(surface, color, (left[x], top[rows.start + start]), (left[x], top[rows.start + end]), width)
+        self._posts(cols, rows)
+
+        for overlay, (color, width) in self.overlays.items():
+            self._polyline(overlay, color, width)
+
+        self.screen.blit(surface, (0, 0))
+        self.dirty = []
+        if self.marker:
+            self._draw_marker()
+        pygame.display.flip()
+
+    def set_view(self, x0, y0, cell_size=None):
+        """Move the top-left corner of the view to cell (x0, y0), optionally zooming."""
+        if cell_size is not None:
+            self.cell_size = max(1, cell_size)
+        max_x = max(0, self.grid.cols - self.width // self.cell_size)
+        max_y = max(0, self.grid.rows - self.height // self.cell_size)
+        self.origin = (min(max(0, x0), max_x), min(max(0, y0), max_y))
+        self._layout()
+        self.redraw()
+
+    def handle_event(self, event):
+        """Pan with the arrow keys and zoom with +/-; returns True if the view changed."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        x0, y0 = self.origin
+        step_x = max(1, len(self.visible_cols) // 4)
+        step_y = max(1, len(self.visible_rows) // 4)
+        moves = {pygame.K_LEFT: (-step_x, 0), pygame.K_RIGHT: (step_x, 0), pygame.K_UP: (0, -step_y), pygame.K_DOWN: (0, step_y)}
+        if event.key in moves:
+            dx, dy = moves[event.key]
+            self.set_view(x0 + dx, y0 + dy)
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self._zoom(2)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self._zoom(0.5)
+        else:
+            return False
+        return True
+
+    def _zoom(self, factor):
+        # Keep the cell in the middle of the view where it is
+        middle_x = self.visible_cols.start + len(self.visible_cols) // 2
+        middle_y = self.visible_rows.start + len(self.visible_rows) // 2
+        size = max(1, int(self.cell_size * factor))
+        self.set_view(middle_x - self.width // size // 2, middle_y - self.height // size // 2, size)
@@ -0,0 +1,34 @@
+"""Seeds and random sources for the generators.
+
+Generators draw from a random.Random. make_rng() builds one from whatever the
+caller has and also returns the 64-bit seed it was built from, which is what
+gets recorded in saved mazes: with the same algorithm, size and seed a
+generator carves exactly the same maze again.
+"""
+import random
+
+import numpy as np
+
+SEED_BITS = 64
+
+
+def make_rng(seed=None):
+    """Return (rng, seed) for an int seed, a random.Random, a NumPy Generator or None.
+
+    Generators are not used directly: a 64-bit seed is drawn from them so the
+    result can still be reproduced from the recorded seed alone. None draws
+    the seed from the operating system.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(SEED_BITS)
+    elif isinstance(seed, random.Random):
+        seed = seed.getrandbits(SEED_BITS)
+    elif isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(0, 1 << SEED_BITS, dtype=np.uint64))
+    elif isinstance(seed, (int, np.integer)) and not isinstance(seed, bool):
+        seed = int(seed)
+        if not 0 <= seed < 1 << SEED_BITS:
+            raise ValueError(f"seed must fit in {SEED_BITS} unsigned bits, got {seed}")
+    else:
+        raise TypeError(f"expected an int seed, random.Random or numpy Generator, got {type(seed).__name__}")
+    return random.Random(seed), seed
@@ -0,0 +1,538 @@
+"""Headless maze solvers.
+
+Solvers work on flat cell indices (y * cols + x) over a MazeGrid and return
+`(path, stats)`, where path is a list of (x, y) cells from start to goal (empty
+if the goal can't be reached) and stats counts the work done. Visualizers can
+follow the search with an observer, called as ``observer(event, x, y, direction)``:
+
+    VISIT   (x, y) is reached for the first time or on a shorter route; `direction`
+            is the move taken into it (0 for the start)
+    EXPAND  (x, y) is taken off the frontier and its neighbours examined
+    FILL    dead-end filling walls off (x, y)
+
+Solvers with a priority queue report `popped` alongside `pushed`; the
+difference from `expanded` is the stale entries skipped by lazy deletion. solve() hands the
+stats to an optional trace.Tracer.
+"""
+from array import array
+from heapq import heappush, heappop
+
+import numpy as np
+
+from .constants import N, S, E, W, OPPOSITE
+from .grid import check_weights
+from .trace import phase, record
+
+VISIT = "visit"
+EXPAND = "expand"
+FILL = "fill"
+
+# Largest step cost dijkstra() handles with a bucket queue rather than a heap
+BUCKET_LIMIT = 255
+
+# Heap entries pack (priority, cell) into one int so comparisons stay cheap
+_SHIFT = 32
+_MASK = (1 << _SHIFT) - 1
+
+# Highest direction bit of every 4-bit direction set
+_HIGHEST = bytes(1 << (m.bit_length() - 1) if m else 0 for m in range(16))
+_ENTERED = 0x10
+
+# Number of open walls for every cell value
+_DEGREE = bytes(bin(value & (N | S | E | W)).count("1") for value in range(256))
+
+
+def _index(grid, cell):
+    x, y = cell
+    if not grid.in_bounds(x, y):
+        raise ValueError(f"cell {cell} is outside the {grid.cols}x{grid.rows} maze")
+    return y * grid.cols + x
+
+
+def _path(parent, start, goal, cols):
+    if goal != start and parent[goal] == -1:
+        return []
+    path = []
+    i = goal
+    while i != start:
+        path.append((i % cols, i // cols))
+        i = parent[i]
+    path.append((start % cols, start // cols))
+    path.reverse()
+    return path
+
+
+def _manhattan(grid, goal):
+    """Flat Manhattan distance from every cell to `goal`, computed once per search."""
+    gx, gy = goal
+    rows = np.abs(np.arange(grid.rows, dtype=np.int32) - gy)
+    columns = np.abs(np.arange(grid.cols, dtype=np.int32) - gx)
+    return memoryview((rows[:, None] + columns[None, :]).reshape(-1))
+
+
+def astar(grid, start, goal, observer=None, tracer=None):
+    cols = grid.cols
+    cells = grid.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+    h = _manhattan(grid, goal)
+
+    g_score = array("i", [-1]) * grid.size
+    parent = array("i", [-1]) * grid.size
+    closed = bytearray(grid.size)
+    g_score[s] = 0
+    expanded, pushed = 0, 1
+    if observer:
+        observer(VISIT, start[0], start[1], 0)
+
+    # On a unit grid a step changes the Manhattan distance by exactly one, so
+    # a neighbour's f = g + h is either the current f or f + 2. The open set
+    # is therefore just two buckets: `current` holds every entry at the
+    # lowest f and `later` every entry at f + 2. Popping `current` as a stack
+    # breaks ties toward the deepest cell. Stale entries are skipped through
+    # `closed`; the heuristic is consistent, so a closed cell is final.
+    current = [s]
+    later = []
+    found = False
+    while current and not found:
+        while current:
+            i = current.pop()
+            if closed[i]:
+                continue
+            closed[i] = 1
+            expanded += 1
+            if observer:
+                observer(EXPAND, i % cols, i // cols, 0)
+            if i == t:
+                found = True
+                break
+
+            cell = cells[i]
+            h_i = h[i]
+            tentative_g_score = g_score[i] + 1
+            for d, offset in moves:
+                if not cell & d:
+                    continue
+                j = i + offset
+                if closed[j] or (g_score[j] != -1 and g_score[j] <= tentative_g_score):
+                    continue
+                g_score[j] = tentative_g_score
+                parent[j] = i
+                if h[j] < h_i:
+                    current.append(j)
+                else:
+                    later.append(j)
+                pushed += 1
+                if observer:
+                    observer(VISIT, j % cols, j // cols, d)
+        if not found:
+            current, later = later, current
+
+    stats = {"expanded": expanded, "pushed": pushed, "popped": pushed - len(current) - len(later)}
+    return _path(parent, s, t, cols), stats
+
+
+def bfs(grid, start, goal, observer=None, tracer=None):
+    cols = grid.cols
+    cells = grid.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+
+    # A cell is seen once it has a parent; the start is its own parent
+    parent = array("i", [-1]) * grid.size
+    parent[s] = s
+    queue = array("i", [s])
+    head = 0
+    if observer:
+        observer(VISIT, start[0], start[1], 0)
+
+    while head < len(queue):
+        i = queue[head]
+        head += 1
+        if observer:
+            observer(EXPAND, i % cols, i // cols, 0)
+        if i == t:
+            break
+
+        cell = cells[i]
+        for d, offset in moves:
+            if cell & d:
+                j = i + offset
+                if parent[j] == -1:
+                    parent[j] = i
+                    queue.append(j)
+                    if observer:
+                        observer(VISIT, j % cols, j // cols, d)
+
+    return _path(parent, s, t, cols), {"expanded": head}
+
+
+def _join(forward, backward, start, goal, meet, cols):
+    """Path from start to meet through `forward`, then on to goal through `backward`."""
+    path = _path(forward, start, meet, cols)
+    i = meet
+    while i != goal:
+        i = backward[i]
+        path.append((i % cols, i // cols))
+    return path
+
+
+def bidirectional_bfs(grid, start, goal, observer=None, tracer=None):
+    """Breadth-first search from both ends, one whole level of the smaller side at a time.
+
+    Finishing the level in which the two searches touch and keeping the
+    shortest join keeps the path as short as plain bfs finds.
+    """
+    cols = grid.cols
+    cells = grid.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+
+    dist = (array("i", [-1]) * grid.size, array("i", [-1]) * grid.size)
+    parent = (array("i", [-1]) * grid.size, array("i", [-1]) * grid.size)
+    frontier = [array("i", [s]), array("i", [t])]
+    dist[0][s] = dist[1][t] = 0
+    expanded = 0
+    if observer:
+        observer(VISIT, start[0], start[1], 0)
+        observer(VISIT, goal[0], goal[1], 0)
+    if s == t:
+        return [start], {"expanded": 0}
+
+    best, meet = -1, -1
+    while frontier[0] and frontier[1] and meet == -1:
+        side = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+        seen, other, up = dist[side], dist[1 - side], parent[side]
+        level = array("i")
+        for i in frontier[side]:
+            expanded += 1
+            if observer:
+                observer(EXPAND, i % cols, i // cols, 0)
+            cell = cells[i]
+            length = seen[i] + 1
+            for d, offset in moves:
+                if not cell & d:
+                    continue
+                j = i + offset
+                if other[j] != -1 and (best == -1 or length + other[j] < best):
+                    best = length + other[j]
+                    meet = j
+                if seen[j] == -1:
+                    seen[j] = length
+                    up[j] = i
+                    level.append(j)
+                    if observer:
+                        observer(VISIT, j % cols, j // cols, d)
+        frontier[side] = level
+
+    if meet == -1:
+        return [], {"expanded": expanded}
+    return _join(parent[0], parent[1], s, t, meet, cols), {"expanded": expanded}
+
+
+def bidirectional_astar(grid, start, goal, observer=None, tracer=None):
+    """A* from both ends at once.
+
+    Both sides use the averaged heuristic (h_goal - h_start) / 2, with the sign
+    flipped for the backward side, which keeps it consistent for both. Keys
+    are doubled to stay integral and offset by the start-goal distance to stay
+    non-negative. Every time a side scores a cell the other side has reached,
+    the joined route is a candidate. The search stops once the two smallest
+    keys add up to twice the best candidate.
+    """
+    cols = grid.cols
+    cells = grid.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+    sx, sy = start
+    tx, ty = goal
+    offset = abs(sx - tx) + abs(sy - ty)
+
+    g_score = (array("i", [-1]) * grid.size, array("i", [-1]) * grid.size)
+    parent = (array("i", [-1]) * grid.size, array("i", [-1]) * grid.size)
+    closed = (bytearray(grid.size), bytearray(grid.size))
+    open_sets = ([((2 * offset) << _SHIFT) | s], [((2 * offset) << _SHIFT) | t])
+    g_score[0][s] = g_score[1][t] = 0
+    expanded, pushed = 0, 2
+    if observer:
+        observer(VISIT, sx, sy, 0)
+        observer(VISIT, tx, ty, 0)
+
+    best, meet = (0, s) if s == t else (-1, -1)
+    while open_sets[0] and open_sets[1]:
+        if best != -1 and (open_sets[0][0] >> _SHIFT) + (open_sets[1][0] >> _SHIFT) >= 2 * (best + offset):
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, score, other, up, done = open_sets[side], g_score[side], g_score[1 - side], parent[side], closed[side]
+        sign = 1 if side == 0 else -1
+
+        i = heappop(open_set) & _MASK
+        if done[i]:
+            continue
+        done[i] = 1
+        expanded += 1
+        if observer:
+            observer(EXPAND, i % cols, i // cols, 0)
+
+        cell = cells[i]
+        tentative_g_score = score[i] + 1
+        for d, step in moves:
+            if not cell & d:
+                continue
+            j = i + step
+            if done[j] or (score[j] != -1 and score[j] <= tentative_g_score):
+                continue
+            score[j] = tentative_g_score
+            up[j] = i
+            if other[j] != -1 and (best == -1 or tentative_g_score + other[j] < best):
+                best = tentative_g_score + other[j]
+                meet = j
+            y, x = divmod(j, cols)
+            h = abs(x - tx) + abs(y - ty) - abs(x - sx) - abs(y - sy)
+            heappush(open_set, ((2 * tentative_g_score + sign * h + offset) << _SHIFT) | j)
+            pushed += 1
+            if observer:
+                observer(VISIT, x, y, d)
+
+    stats = {"expanded": expanded, "pushed": pushed, "popped": pushed - len(open_sets[0]) - len(open_sets[1])}
+    if meet == -1:
+        return [], stats
+    return _join(parent[0], parent[1], s, t, meet, cols), stats
+
+
+def dfs(grid, start, goal, observer=None, tracer=None):
+    cols = grid.cols
+    cells = grid.buffer()
+    step = [0] * 9
+    keep = [0] * 9
+    for d, offset in grid.offsets().items():
+        step[d] = offset
+        keep[d] = (N | S | E | W) & ~OPPOSITE[d]
+    s, t = _index(grid, start), _index(grid, goal)
+
+    # One byte per cell: the directions still to try in the low bits, plus
+    # _ENTERED once the search has been there. A cell's walls are read once,
+    # when it is entered, minus the way back, and directions are taken
+    # highest bit first (W, E, S, N), so backtracking never rescans a cell.
+    todo = bytearray(grid.size)
+    todo[s] = (cells[s] & (N | S | E | W)) | _ENTERED
+    # The stack is the path from the start to the cell being explored
+    stack = [s]
+    expanded, backtracks = 1, 0
+    if observer:
+        observer(VISIT, start[0], start[1], 0)
+        observer(EXPAND, start[0], start[1], 0)
+
+    i = s
+    while i != t:
+        left = todo[i] & (N | S | E | W)
+        while left:
+            d = _HIGHEST[left]
+            left ^= d
+            j = i + step[d]
+            if not todo[j]:
+                break
+        else:
+            todo[i] = _ENTERED
+            stack.pop()
+            backtracks += 1
+            if not stack:
+                break
+            i = stack[-1]
+            continue
+
+        todo[i] = left | _ENTERED
+        todo[j] = (cells[j] & keep[d]) | _ENTERED
+        stack.append(j)
+        expanded += 1
+        if observer:
+            observer(VISIT, j % cols, j // cols, d)
+            observer(EXPAND, j % cols, j // cols, 0)
+        i = j
+
+    path = [(i % cols, i // cols) for i in stack]
+    return path, {"expanded": expanded, "backtracks": backtracks}
+
+
+def _costs(grid):
+    """Flat cost of stepping into each cell as a memoryview, and the largest cost."""
+    if grid.weights is None:
+        return memoryview(b"\x01" * grid.size), 1
+    # The array may have been edited in place since it was assigned
+    check_weights(grid.weights, grid.rows, grid.cols)
+    # int64 gives the memoryview a native format whatever the dtype or byte order
+    weights = np.ascontiguousarray(grid.weights, dtype=np.int64).reshape(-1)
+    return memoryview(weights), int(weights.max()) if weights.size else 0
+
+
+def _dijkstra_buckets(cells, cost, top, moves, s, t, cols, observer):
+    """Dial's algorithm: a ring of top + 1 buckets, one per pending distance."""
+    n = len(cells)
+    dist = array("q", [-1]) * n
+    parent = array("i", [-1]) * n
+    ring = top + 1
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(s)
+    dist[s] = 0
+    expanded, pushed, popped = 0, 1, 0
+
+    # Every pending entry lies within `top` of the distance being settled, so
+    # the ring never wraps onto itself. An entry whose cell has since been
+    # reached more cheaply no longer matches dist and is skipped.
+    g = 0
+    found = False
+    while pushed > popped and not found:
+        bucket = buckets[g % ring]
+        # Zero-cost steps append to the bucket being read, which a list allows
+        for i in bucket:
+            popped += 1
+            if dist[i] != g:
+                continue
+            expanded += 1
+            if observer:
+                observer(EXPAND, i % cols, i // cols, 0)
+            if i == t:
+                found = True
+                break
+            cell = cells[i]
+            for d, offset in moves:
+                if cell & d:
+                    j = i + offset
+                    tentative = g + cost[j]
+                    if dist[j] == -1 or tentative < dist[j]:
+                        dist[j] = tentative
+                        parent[j] = i
+                        buckets[tentative % ring].append(j)
+                        pushed += 1
+                        if observer:
+                            observer(VISIT, j % cols, j // cols, d)
+        bucket.clear()
+        g += 1
+    return parent, dist[t], {"expanded": expanded, "pushed": pushed, "popped": popped}
+
+
+def _dijkstra_heap(cells, cost, moves, s, t, cols, observer):
+    n = len(cells)
+    dist = array("q", [-1]) * n
+    parent = array("i", [-1]) * n
+    closed = bytearray(n)
+    dist[s] = 0
+    open_set = [s]
+    expanded, pushed = 0, 1
+
+    while open_set:
+        i = heappop(open_set) & _MASK
+        if closed[i]:
+            continue
+        closed[i] = 1
+        expanded += 1
+        if observer:
+            observer(EXPAND, i % cols, i // cols, 0)
+        if i == t:
+            break
+
+        cell = cells[i]
+        g = dist[i]
+        for d, offset in moves:
+            if not cell & d:
+                continue
+            j = i + offset
+            tentative = g + cost[j]
+            if closed[j] or (dist[j] != -1 and dist[j] <= tentative):
+                continue
+            dist[j] = tentative
+            parent[j] = i
+            heappush(open_set, (tentative << _SHIFT) | j)
+            pushed += 1
+            if observer:
+                observer(VISIT, j % cols, j // cols, d)
+
+    return parent, dist[t], {"expanded": expanded, "pushed": pushed, "popped": pushed - len(open_set)}
+
+
+def dijkstra(grid, start, goal, observer=None, tracer=None):
+    """Cheapest path under grid.weights (unit steps without them).
+
+    Small integer costs, up to BUCKET_LIMIT, use a bucket queue that settles
+    cells in constant time each; larger costs fall back to a binary heap. The
+    stats include `cost`, the total cost of the path (-1 if there is none).
+    """
+    cols = grid.cols
+    cells = grid.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+    if observer:
+        observer(VISIT, start[0], start[1], 0)
+
+    cost, top = _costs(grid)
+    if top <= BUCKET_LIMIT:
+        with phase(tracer, "dijkstra buckets"):
+            parent, total, stats = _dijkstra_buckets(cells, cost, top, moves, s, t, cols, observer)
+    else:
+        with phase(tracer, "dijkstra heap"):
+            parent, total, stats = _dijkstra_heap(cells, cost, moves, s, t, cols, observer)
+    stats["cost"] = total
+    return _path(parent, s, t, cols), stats
+
+
+def dead_end_filling(grid, start, goal, observer=None, tracer=None):
+    """Wall off dead ends until only the solution is left, then walk it.
+
+    Works on a copy of the grid. Every dead end is queued once up front and a
+    neighbour is only queued when filling turns it into a dead end, so each
+    cell is handled a constant number of times.
+    """
+    cols = grid.cols
+    work = grid.copy()
+    cells = work.buffer()
+    moves = tuple(grid.offsets().items())
+    s, t = _index(grid, start), _index(grid, goal)
+
+    dead_ends = np.flatnonzero(work.degree().ravel() == 1)
+    queue = array("i", dead_ends[(dead_ends != s) & (dead_ends != t)].tolist())
+    head = filled = 0
+    with phase(tracer, "dead_end_filling fill"):
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            cell = cells[i]
+            # Filling its only neighbour can leave a queued cell with no way out
+            if _DEGREE[cell] != 1:
+                continue
+
+            for d, offset in moves:
+                if cell & d:
+                    j = i + offset
+                    cells[j] &= ~OPPOSITE[d] & 0xFF
+                    break
+            cells[i] = 0
+            filled += 1
+            if observer:
+                observer(FILL, i % cols, i // cols, 0)
+            if j != s and j != t and _DEGREE[cells[j]] == 1:
+                queue.append(j)
+
+    with phase(tracer, "dead_end_filling walk"):
+        path, stats = bfs(work, start, goal)
+    return path, {"dead_ends": len(dead_ends), "queued": len(queue), "filled": filled, "expanded": stats["expanded"]}
+
+
+SOLVERS = {
+    "astar": astar,
+    "bfs": bfs,
+    "bidirectional_astar": bidirectional_astar,
+    "bidirectional_bfs": bidirectional_bfs,
+    "dead_end_filling": dead_end_filling,
+    "dfs": dfs,
+    "dijkstra": dijkstra,
+}
+
+
+def solve(grid, start, goal, algorithm="bfs", observer=None, tracer=None):
+    """Find a path between two cells of a maze; returns (path, stats)."""
+    if algorithm not in SOLVERS:
+        raise ValueError(f"unknown solver: {algorithm!r}")
+    with phase(tracer, f"solve {algorithm}"):
+        path, stats = SOLVERS[algorithm](grid, start, goal, observer, tracer)
+    record(tracer, algorithm, stats)
+    return path, stats
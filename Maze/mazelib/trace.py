@@ -0,0 +1,69 @@
+"""Counters and phase timings for generators and solvers.
+
+The algorithms never call a tracer from their inner loops. They keep plain
+local counters, many of which they need anyway, and return them as a stats
+dict. generate(), solve() and the visualizers hand that dict to the tracer
+once the run is over, so a run without a tracer pays nothing extra. Phases are
+timed only where a tracer is given, with a few calls per run.
+
+A Tracer exports either a text summary or a JSON trace in the Chrome trace
+event format, which chrome://tracing and Perfetto can open:
+
+    tracer = Tracer()
+    generate(500, 500, "wilson", seed=7, tracer=tracer)
+    print(tracer.summary())
+    tracer.dump("wilson-7.json")
+"""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Tracer:
+    def __init__(self):
+        self.counters = {}
+        self.phases = []
+        self.origin = time.perf_counter()
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record(self, prefix, stats):
+        """Add every number in a stats dict to the counter `prefix.name`."""
+        for name, value in stats.items():
+            self.count(f"{prefix}.{name}", value)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, started - self.origin, time.perf_counter() - started))
+
+    def summary(self):
+        lines = [f"{name:40} {seconds * 1000:12.2f} ms" for name, _, seconds in self.phases]
+        lines += [f"{name:40} {value:12}" for name, value in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+    def to_json(self):
+        """The phases as complete events and the counters as one counter event."""
+        events = [{"name": name, "ph": "X", "ts": start * 1e6, "dur": seconds * 1e6, "pid": 1, "tid": 1}
+                  for name, start, seconds in self.phases]
+        end = max((start + seconds for _, start, seconds in self.phases), default=0)
+        events.append({"name": "counters", "ph": "C", "ts": end * 1e6, "pid": 1, "tid": 1, "args": self.counters})
+        return {"traceEvents": events, "counters": self.counters}
+
+    def dump(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.to_json(), f, indent=1)
+
+
+def phase(tracer, name):
+    """tracer.phase(name), or a no-op when there is no tracer."""
+    return tracer.phase(name) if tracer else nullcontext()
+
+
+def record(tracer, prefix, stats):
+    if tracer:
+        tracer.record(prefix, stats)
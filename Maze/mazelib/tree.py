@@ -0,0 +1,145 @@
+"""Instant path queries on perfect mazes.
+
+A perfect maze is a spanning tree, so the only route between two cells
+climbs from each of them to their lowest common ancestor. MazeTree roots the
+tree once, keeping every cell's parent and depth, and builds a
+binary-lifting table whose row k holds every cell's 2**k-th ancestor. After
+that, a distance query costs O(log V) and a path query O(path length), with
+no search at all:
+
+    tree = MazeTree(grid)
+    tree.distance((0, 0), (99, 99))
+    path = tree.path((0, 0), (99, 99))
+
+The table takes 4 bytes per cell per level, and there are log2(tree height)
+levels. Changing the grid afterwards makes the index stale.
+"""
+from array import array
+
+import numpy as np
+
+from .solvers import _index
+
+
+class MazeTree:
+    def __init__(self, grid, root=(0, 0)):
+        self.grid = grid
+        self.cols = grid.cols
+        n = grid.size
+        cells = grid.buffer()
+        moves = tuple(grid.offsets().items())
+        r = _index(grid, root)
+
+        # Root the tree with a breadth-first walk; the root is its own parent
+        parent = array("i", [-1]) * n
+        depth = array("i", [0]) * n
+        parent[r] = r
+        queue = array("i", [r])
+        head = edges = 0
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            cell = cells[i]
+            for d, offset in moves:
+                if cell & d:
+                    j = i + offset
+                    edges += 1
+                    if parent[j] == -1:
+                        parent[j] = i
+                        depth[j] = depth[i] + 1
+                        queue.append(j)
+        # Every open wall is counted from both sides
+        if head != n or edges != 2 * (n - 1):
+            raise ValueError("MazeTree needs a perfect maze: every cell connected and no loops")
+
+        self.parent = np.frombuffer(parent, dtype=np.int32)
+        self.depth = np.frombuffer(depth, dtype=np.int32)
+        self.root = r
+        levels = max(1, int(self.depth.max()).bit_length())
+        self.up = np.empty((levels, n), dtype=np.int32)
+        self.up[0] = self.parent
+        for k in range(1, levels):
+            self.up[k] = self.up[k - 1][self.up[k - 1]]
+        self._parent = parent
+        self._depth = depth
+        self._up = [memoryview(row) for row in self.up]
+
+    def __repr__(self):
+        return f"MazeTree({self.grid!r}, levels={len(self._up)})"
+
+    def _lca(self, u, v):
+        depth, up = self._depth, self._up
+        if depth[u] < depth[v]:
+            u, v = v, u
+        diff = depth[u] - depth[v]
+        k = 0
+        while diff:
+            if diff & 1:
+                u = up[k][u]
+            diff >>= 1
+            k += 1
+        if u == v:
+            return u
+        for row in reversed(up):
+            if row[u] != row[v]:
+                u, v = row[u], row[v]
+        return up[0][u]
+
+    def lca(self, a, b):
+        """The cell where the routes from a and b to the root join."""
+        return self.grid.coords(self._lca(_index(self.grid, a), _index(self.grid, b)))
+
+    def distance(self, a, b):
+        """Number of steps on the path between cells a and b."""
+        u, v = _index(self.grid, a), _index(self.grid, b)
+        depth = self._depth
+        return depth[u] + depth[v] - 2 * depth[self._lca(u, v)]
+
+    def path(self, a, b):
+        """The path from a to b as a list of (x, y) cells, like the solvers return."""
+        u, v = _index(self.grid, a), _index(self.grid, b)
+        top = self._lca(u, v)
+        parent, cols = self._parent, self.cols
+        head = []
+        while u != top:
+            head.append((u % cols, u // cols))
+            u = parent[u]
+        tail = []
+        while v != top:
+            tail.append((v % cols, v // cols))
+            v = parent[v]
+        head.append((top % cols, top // cols))
+        head.extend(reversed(tail))
+        return head
+
+    def solve(self, start, goal):
+        """Same interface as the solvers in solvers.py; `stats` is always empty."""
+        return self.path(start, goal), {}
+
+    def _indices(self, cells):
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        x, y = cells[:, 0], cells[:, 1]
+        if np.any((x < 0) | (x >= self.grid.cols) | (y < 0) | (y >= self.grid.rows)):
+            raise ValueError(f"cells outside the {self.grid.cols}x{self.grid.rows} maze")
+        return y * self.cols + x
+
+    def lca_many(self, us, vs):
+        """Vectorized LCA of flat cell indices us[k] and vs[k]."""
+        depth, up = self.depth, self.up
+        us, vs = np.asarray(us, dtype=np.int64), np.asarray(vs, dtype=np.int64)
+        swap = depth[us] < depth[vs]
+        us, vs = np.where(swap, vs, us), np.where(swap, us, vs)
+        diff = depth[us] - depth[vs]
+        for k in range(len(up)):
+            us = np.where((diff >> k) & 1, up[k][us], us)
+        for k in reversed(range(len(up))):
+            pu, pv = up[k][us], up[k][vs]
+            differ = pu != pv
+            us, vs = np.where(differ, pu, us), np.where(differ, pv, vs)
+        return np.where(us == vs, us, up[0][us])
+
+    def distances(self, starts, goals):
+        """Distances for many queries at once; starts and goals are sequences of (x, y)."""
+        us, vs = self._indices(starts), self._indices(goals)
+        depth = self.depth
+        return depth[us] + depth[vs] - 2 * depth[self.lca_many(us, vs)]
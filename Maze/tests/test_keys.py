@@ -0,0 +1,20 @@
+import pytest
+
+from mazelib import from_key, generate, grid_key, maze_key
+
+
+def test_key_rebuilds_the_maze():
+    grid = generate(7, 9, "kruskal", 12345)
+    key = grid_key(grid)
+    assert len(key) == 16
+    assert from_key(key) == grid
+
+
+def test_largest_key():
+    assert len(maze_key("wilson", 65535, 65535, 2 ** 64 - 1)) == 16
+
+
+@pytest.mark.parametrize("rows, cols, seed", [(70000, 3, 1), (3, 65536, 1), (-1, 3, 1), (3, 3, 2 ** 64), (3, 3, -1)])
+def test_out_of_range_keys_are_rejected(rows, cols, seed):
+    with pytest.raises(ValueError):
+        maze_key("wilson", rows, cols, seed)
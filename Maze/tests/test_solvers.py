@@ -0,0 +1,163 @@
+"""Randomized cross-checks of the solvers.
+
+Each test solves many small mazes, from perfect ones to braided ones with
+extra openings and ones with walled-off cells, between random cells, and
+checks that the path is valid and as short as a breadth-first distance field
+says it can be, or for weighted mazes as cheap as a plain heap Dijkstra.
+"""
+import heapq
+import random
+
+import numpy as np
+import pytest
+
+from mazelib import MazeGrid, distance_field, generate, solvers
+from mazelib.constants import N, S, E, W, DX, DY, OPPOSITE
+
+TRIALS = 300
+
+
+def random_maze(rng, trial):
+    rows, cols = rng.randint(1, 14), rng.randint(1, 14)
+    grid = generate(rows, cols, rng.choice(["backtracker", "kruskal", "wilson"]), trial)
+    # Braid: open random walls on both sides
+    for _ in range(rng.randint(0, 40)):
+        x, y, d = rng.randrange(cols), rng.randrange(rows), rng.choice((N, S, E, W))
+        if grid.in_bounds(x + DX[d], y + DY[d]):
+            grid[y, x] |= d
+            grid[y + DY[d], x + DX[d]] |= OPPOSITE[d]
+    # Disconnect: wall off one cell completely
+    if rng.random() < 0.3:
+        x, y = rng.randrange(cols), rng.randrange(rows)
+        for d in (N, S, E, W):
+            if grid[y, x] & d:
+                grid.close(x + DX[d], y + DY[d], OPPOSITE[d])
+        grid[y, x] &= ~(N | S | E | W) & 0xFF
+    start = (rng.randrange(cols), rng.randrange(rows))
+    goal = (rng.randrange(cols), rng.randrange(rows))
+    return grid, start, goal
+
+
+def check_path(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        (d,) = [d for d in (N, S, E, W) if (x + DX[d], y + DY[d]) == (nx, ny)]
+        assert grid[y, x] & d
+
+
+def check_shortest(solver, seed):
+    rng = random.Random(seed)
+    for trial in range(TRIALS):
+        grid, start, goal = random_maze(rng, trial)
+        path, _ = solver(grid, start, goal)
+        distance = int(distance_field(grid, start)[goal[1], goal[0]])
+        if distance < 0:
+            assert path == []
+        else:
+            check_path(grid, path, start, goal)
+            assert len(path) == distance + 1
+
+
+def test_astar_is_shortest():
+    check_shortest(solvers.astar, 1)
+
+
+def test_astar_start_is_goal():
+    grid = generate(5, 5, "wilson", 1)
+    assert solvers.astar(grid, (2, 3), (2, 3))[0] == [(2, 3)]
+
+
+def test_astar_rejects_cells_outside_the_maze():
+    with pytest.raises(ValueError):
+        solvers.astar(generate(3, 3, "wilson", 1), (0, 0), (3, 0))
+
+
+@pytest.mark.parametrize("name", ["bidirectional_bfs", "bidirectional_astar"])
+def test_bidirectional_is_shortest(name):
+    check_shortest(solvers.SOLVERS[name], 2)
+
+
+@pytest.mark.parametrize("name", ["bidirectional_bfs", "bidirectional_astar"])
+def test_bidirectional_on_long_corridors(name):
+    # Backtracker mazes have long winding solutions, where a stopping rule
+    # that ends the search too early shows up as a detour
+    for seed in range(20):
+        grid = generate(30, 30, "backtracker", seed)
+        path, _ = solvers.SOLVERS[name](grid, (0, 0), (29, 29))
+        assert len(path) == len(solvers.bfs(grid, (0, 0), (29, 29))[0])
+
+
+def cheapest(grid, start, goal):
+    """Reference Dijkstra over (x, y) cells with a plain tuple heap."""
+    costs = {start: 0}
+    queue = [(0, start)]
+    while queue:
+        cost, (x, y) = heapq.heappop(queue)
+        if cost > costs[(x, y)]:
+            continue
+        for d in (N, S, E, W):
+            if grid[y, x] & d:
+                nx, ny = x + DX[d], y + DY[d]
+                step = 1 if grid.weights is None else int(grid.weights[ny, nx])
+                if cost + step < costs.get((nx, ny), cost + step + 1):
+                    costs[(nx, ny)] = cost + step
+                    heapq.heappush(queue, (cost + step, (nx, ny)))
+    return costs.get(goal, -1)
+
+
+@pytest.mark.parametrize("bucket_limit", [solvers.BUCKET_LIMIT, -1])
+def test_dijkstra_is_cheapest(monkeypatch, bucket_limit):
+    # A limit of -1 sends every search to the heap
+    monkeypatch.setattr(solvers, "BUCKET_LIMIT", bucket_limit)
+    rng = random.Random(3)
+    for trial in range(TRIALS):
+        grid, start, goal = random_maze(rng, trial)
+        choice = rng.random()
+        if choice < 0.6:
+            # Small costs, zero included, as used for terrain
+            values = [0, 1, 1, 3, 7]
+        elif choice < 0.8:
+            values = [1, 2, 1000, 70000]
+        else:
+            values = None
+        if values:
+            grid.weights = np.array([[rng.choice(values) for _ in range(grid.cols)] for _ in range(grid.rows)])
+        path, stats = solvers.dijkstra(grid, start, goal)
+        cost = cheapest(grid, start, goal)
+        assert stats["cost"] == cost
+        if cost < 0:
+            assert path == []
+        else:
+            check_path(grid, path, start, goal)
+            steps = [1 if grid.weights is None else int(grid.weights[y, x]) for x, y in path[1:]]
+            assert sum(steps) == cost
+
+
+def test_dijkstra_accepts_any_integer_dtype():
+    grid = generate(5, 5, "kruskal", 1)
+    for dtype in (np.uint8, np.uint16, ">i4", "<i8", np.uint64):
+        grid.weights = np.full((5, 5), 2, dtype=dtype)
+        assert solvers.dijkstra(grid, (0, 0), (4, 4))[1]["cost"] == 2 * (len(solvers.bfs(grid, (0, 0), (4, 4))[0]) - 1)
+
+
+@pytest.mark.parametrize("weights", [
+    np.ones(25, dtype=np.uint8),
+    np.ones((5, 5)),
+    [[1] * 5] * 5,
+    np.full((5, 5), -1),
+    np.full((5, 5), 2 ** 63, dtype=np.uint64),
+])
+def test_bad_weights_are_rejected(weights):
+    grid = generate(5, 5, "kruskal", 1)
+    with pytest.raises(ValueError):
+        grid.weights = weights
+    with pytest.raises(ValueError):
+        MazeGrid(5, 5, weights=weights)
+
+
+def test_weights_edited_in_place_are_checked():
+    grid = generate(5, 5, "kruskal", 1)
+    grid.weights = np.ones((5, 5), dtype=np.int64)
+    grid.weights[2, :] = -1
+    with pytest.raises(ValueError):
+        solvers.dijkstra(grid, (0, 0), (4, 4))